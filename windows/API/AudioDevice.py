@@ -5,12 +5,14 @@ This module encapsulates all relevant information about an audio device,
 including its capabilities, supported formats, and current status.
 """
 
+from __future__ import annotations
+
 import asyncio
-from dataclasses import dataclass, field
+import logging
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum, auto
-from typing import List, Optional, Callable, Dict, Any
-import uuid
+from typing import List, Optional, Callable, Dict, Any, Set
 
 try:
     import sounddevice as sd
@@ -33,6 +35,12 @@ from .AudioError import (
     DeviceSelectionFailedError, InvalidDeviceError
 )
 
+logger = logging.getLogger(__name__)
+
+# str.translate with a precomputed table beats str.replace for the
+# single-character substitution done on every device id, every refresh
+_SPACE_TO_UNDER = str.maketrans({' ': '_'})
+
 
 class DeviceType(Enum):
     """Device type enumeration"""
@@ -57,7 +65,7 @@ class DeviceAPI(Enum):
     ASIO = "ASIO"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceCapabilities:
     """Device capabilities"""
     hardware_monitoring: bool
@@ -68,7 +76,7 @@ class DeviceCapabilities:
     supports_loopback: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AudioDevice:
     """
     Represents an audio input or output device.
@@ -106,7 +114,7 @@ class DeviceChangeEvent(Enum):
     DEFAULT_CHANGED = auto()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceChange:
     """Device change information"""
     event: DeviceChangeEvent
@@ -121,45 +129,74 @@ class AudioDeviceManager:
         """Initialize the device manager"""
         self._device_change_handler: Optional[Callable[[DeviceChange], None]] = None
         self._cached_devices: List[AudioDevice] = []
+        self._cached_loopback_devices: List[AudioDevice] = []
         self._last_scan_time: Optional[datetime] = None
+        self._last_loopback_scan_time: Optional[datetime] = None
         self._scan_interval = 1.0  # seconds
         self._pyaudio = pyaudio.PyAudio()
         self._monitoring_task: Optional[asyncio.Task] = None
+        self._monitor_lock: Optional[asyncio.Lock] = None
+        self._reported_errors: Set[str] = set()
         
-    def __del__(self):
-        """Cleanup resources"""
-        if hasattr(self, '_pyaudio'):
+    async def aclose(self) -> None:
+        """
+        Release PortAudio resources deterministically.
+
+        Preferred over relying on garbage collection: finalizers run at
+        unpredictable times (possibly during interpreter shutdown when
+        PortAudio is already unloaded). Call this when done with the
+        manager, or use the manager as an async context manager.
+        """
+        await self.stop_monitoring()
+        if self._pyaudio:
             self._pyaudio.terminate()
-    
+            self._pyaudio = None
+
+    async def __aenter__(self) -> 'AudioDeviceManager':
+        await self.start_monitoring()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    def _get_monitor_lock(self) -> asyncio.Lock:
+        """Lazily create the monitor lock (needs a running event loop)"""
+        if self._monitor_lock is None:
+            self._monitor_lock = asyncio.Lock()
+        return self._monitor_lock
+
     async def start_monitoring(self):
-        """Start monitoring for device changes"""
-        if self._monitoring_task is None:
-            self._monitoring_task = asyncio.create_task(self._monitor_devices())
-    
+        """Start monitoring for device changes (idempotent)"""
+        async with self._get_monitor_lock():
+            if self._monitoring_task is None or self._monitoring_task.done():
+                self._monitoring_task = asyncio.create_task(self._monitor_devices())
+
     async def stop_monitoring(self):
-        """Stop monitoring for device changes"""
-        if self._monitoring_task:
-            self._monitoring_task.cancel()
-            try:
-                await self._monitoring_task
-            except asyncio.CancelledError:
-                pass
-            self._monitoring_task = None
+        """Stop monitoring for device changes (idempotent)"""
+        async with self._get_monitor_lock():
+            if self._monitoring_task:
+                self._monitoring_task.cancel()
+                try:
+                    await self._monitoring_task
+                except asyncio.CancelledError:
+                    pass
+                self._monitoring_task = None
     
     def get_playback_devices(self) -> List[AudioDevice]:
         """Get all available playback devices"""
-        self._refresh_device_list_if_needed()
+        # Playback never needs the expensive loopback walk
+        self._refresh_device_list_if_needed(include_loopback=False)
         return [d for d in self._cached_devices if d.type == DeviceType.OUTPUT]
-    
+
     def get_recording_devices(self) -> List[AudioDevice]:
         """Get all available recording devices (including loopback)"""
         self._refresh_device_list_if_needed()
-        return [d for d in self._cached_devices if d.type in (DeviceType.INPUT, DeviceType.LOOPBACK)]
-    
+        return [d for d in self._all_devices() if d.type in (DeviceType.INPUT, DeviceType.LOOPBACK)]
+
     def get_device_by_id(self, device_id: str) -> Optional[AudioDevice]:
         """Get device by ID"""
         self._refresh_device_list_if_needed()
-        return next((d for d in self._cached_devices if d.id == device_id), None)
+        return next((d for d in self._all_devices() if d.id == device_id), None)
     
     def set_playback_device(self, device: AudioDevice) -> None:
         """Set the default playback device"""
@@ -185,12 +222,12 @@ class AudioDeviceManager:
     
     def get_current_playback_device(self) -> Optional[AudioDevice]:
         """Get current default playback device"""
-        self._refresh_device_list_if_needed()
+        self._refresh_device_list_if_needed(include_loopback=False)
         return next((d for d in self._cached_devices if d.type == DeviceType.OUTPUT and d.is_default), None)
-    
+
     def get_current_recording_device(self) -> Optional[AudioDevice]:
         """Get current default recording device"""
-        self._refresh_device_list_if_needed()
+        self._refresh_device_list_if_needed(include_loopback=False)
         return next((d for d in self._cached_devices if d.type == DeviceType.INPUT and d.is_default), None)
     
     def set_device_change_handler(self, handler: Callable[[DeviceChange], None]) -> None:
@@ -205,94 +242,173 @@ class AudioDeviceManager:
         """Check if device list should be refreshed"""
         if self._last_scan_time is None:
             return True
-        
+
         elapsed = (datetime.now() - self._last_scan_time).total_seconds()
         return elapsed > self._scan_interval
+
+    def _should_refresh_loopback(self) -> bool:
+        """Check if the loopback device list should be refreshed"""
+        if self._last_loopback_scan_time is None:
+            return True
+
+        elapsed = (datetime.now() - self._last_loopback_scan_time).total_seconds()
+        return elapsed > self._scan_interval
     
-    def _refresh_device_list_if_needed(self) -> None:
-        """Refresh device list if needed"""
+    def force_reload_portaudio(self) -> None:
+        """
+        Force PortAudio to pick up hotplugged devices.
+
+        sounddevice caches the PortAudio device list on Windows, so
+        devices plugged in after startup stay invisible until PortAudio
+        is re-initialized. Prefers WASAPI's in-place update (no stream
+        interruption); falls back to re-initializing the library.
+        The cached device list is invalidated so the next getter rescans.
+        """
+        self._force_portaudio_refresh()
+        self._last_scan_time = None
+        self._last_loopback_scan_time = None
+
+    def _force_portaudio_refresh(self) -> None:
+        """Refresh PortAudio's internal device list"""
+        try:
+            update_device_list = getattr(sd._lib, 'PaWasapi_UpdateDeviceList', None)
+            if update_device_list is not None:
+                # WASAPI can update in place without interrupting streams
+                update_device_list()
+                return
+        except Exception as e:
+            self._report_error("_force_portaudio_refresh:wasapi", e)
+
+        try:
+            # Full re-initialization; active streams keep running on the
+            # old instance but new enumerations see current hardware
+            sd._terminate()
+            sd._initialize()
+        except Exception as e:
+            self._report_error("_force_portaudio_refresh:reinit", e)
+
+    def _report_error(self, func: str, error: Exception) -> None:
+        """Log an enumeration error once per distinct failure"""
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+        key = f"{func}:{type(error).__name__}:{error}"
+        if key not in self._reported_errors:
+            self._reported_errors.add(key)
+            logger.warning("%s: %s", func, error)
+
+    def _all_devices(self) -> List[AudioDevice]:
+        """All cached devices (sounddevice plus loopback)"""
+        return self._cached_devices + self._cached_loopback_devices
+
+    def _refresh_device_list_if_needed(self, include_loopback: bool = True) -> None:
+        """
+        Refresh device list if needed.
+
+        The PyAudioWPatch loopback walk is by far the most expensive part
+        of enumeration (PortAudio + WASAPI COM calls), so it's only done
+        when the caller actually needs recording devices.
+        """
         if self._should_refresh_device_list():
-            self._refresh_device_list()
-    
+            self._refresh_sounddevice_list()
+        if include_loopback and self._should_refresh_loopback():
+            self._refresh_loopback_list()
+
     def _refresh_device_list(self) -> None:
-        """Refresh the cached device list"""
+        """Full refresh of the cached device list (monitor path)"""
+        self._refresh_sounddevice_list()
+        self._refresh_loopback_list()
+
+    def _refresh_sounddevice_list(self) -> None:
+        """Refresh the cached input/output devices from sounddevice"""
         try:
             devices = []
-            
+
             # Get devices from sounddevice
             sd_devices = sd.query_devices()
-            
+
             for idx, device_info in enumerate(sd_devices):
                 try:
                     audio_device = self._create_audio_device_from_sounddevice(idx, device_info)
                     if audio_device:
                         devices.append(audio_device)
                 except Exception as e:
-                    print(f"Failed to create AudioDevice for index {idx}: {e}")
-            
-            # If PyAudioWPatch is available, add loopback devices
-            if HAS_PYAUDIOWPATCH and hasattr(self._pyaudio, 'get_loopback_device_info_generator'):
-                try:
-                    # Get loopback devices from PyAudioWPatch
-                    for loopback_info in self._pyaudio.get_loopback_device_info_generator():
-                        loopback_device = self._create_loopback_device_from_pyaudiowpatch(loopback_info)
-                        if loopback_device:
-                            devices.append(loopback_device)
-                except Exception as e:
-                    print(f"Error enumerating loopback devices: {e}")
-            
+                    self._report_error(f"_create_audio_device_from_sounddevice[{idx}]", e)
+
             self._cached_devices = devices
             self._last_scan_time = datetime.now()
-            
+            self._reported_errors.clear()
+
         except Exception as e:
             raise DeviceEnumerationFailedError() from e
+
+    def _refresh_loopback_list(self) -> None:
+        """Refresh the cached loopback devices from PyAudioWPatch"""
+        devices = []
+
+        # If PyAudioWPatch is available, add loopback devices
+        if HAS_PYAUDIOWPATCH and hasattr(self._pyaudio, 'get_loopback_device_info_generator'):
+            try:
+                # Get loopback devices from PyAudioWPatch
+                for loopback_info in self._pyaudio.get_loopback_device_info_generator():
+                    loopback_device = self._create_loopback_device_from_pyaudiowpatch(loopback_info)
+                    if loopback_device:
+                        devices.append(loopback_device)
+            except Exception as e:
+                self._report_error("_refresh_loopback_list", e)
+
+        self._cached_loopback_devices = devices
+        self._last_loopback_scan_time = datetime.now()
     
     def _create_audio_device_from_sounddevice(self, index: int, info: Dict[str, Any]) -> Optional[AudioDevice]:
         """Create AudioDevice from sounddevice info"""
+        # Hoist repeated dict lookups into locals
+        max_in = info['max_input_channels']
+        max_out = info['max_output_channels']
+        name = info['name']
+
         # Skip devices with 0 channels
-        if info['max_input_channels'] == 0 and info['max_output_channels'] == 0:
+        if max_in == 0 and max_out == 0:
             return None
-        
+
         # Determine device type
-        if info['max_output_channels'] > 0 and info['max_input_channels'] == 0:
+        if max_out > 0 and max_in == 0:
             device_type = DeviceType.OUTPUT
-        elif info['max_input_channels'] > 0 and info['max_output_channels'] == 0:
+        elif max_in > 0 and max_out == 0:
             device_type = DeviceType.INPUT
         else:
             # Skip devices that are both input and output for now
             return None
-        
+
         # Get host API info
         host_api_info = sd.query_hostapis(info['hostapi'])
         host_api = self._get_device_api(host_api_info['name'])
-        
+
         # Generate unique ID
-        device_id = f"{host_api.value}_{index}_{info['name'].replace(' ', '_')}"
-        
+        device_id = f"{host_api.value}_{index}_{name.translate(_SPACE_TO_UNDER)}"
+
         # Get supported formats
         supported_formats = self._get_supported_formats(info, device_type)
-        
+
         # Check if default
         is_default = (
             (device_type == DeviceType.OUTPUT and index == sd.default.device[1]) or
             (device_type == DeviceType.INPUT and index == sd.default.device[0])
         )
-        
+
         # Get capabilities
         capabilities = DeviceCapabilities(
             hardware_monitoring=False,
             exclusive_mode=(host_api == DeviceAPI.WASAPI),
-            min_latency=info.get('default_low_output_latency', 0.01) if device_type == DeviceType.OUTPUT 
+            min_latency=info.get('default_low_output_latency', 0.01) if device_type == DeviceType.OUTPUT
                        else info.get('default_low_input_latency', 0.01),
-            max_channels=info['max_output_channels'] if device_type == DeviceType.OUTPUT 
-                        else info['max_input_channels'],
+            max_channels=max_out if device_type == DeviceType.OUTPUT else max_in,
             sample_rates=[44100.0, 48000.0, 96000.0],  # Common rates
             supports_loopback=(host_api == DeviceAPI.WASAPI and device_type == DeviceType.OUTPUT)
         )
-        
+
         return AudioDevice(
             id=device_id,
-            name=info['name'],
+            name=name,
             manufacturer=None,  # Not available from sounddevice
             type=device_type,
             device_index=index,
@@ -307,47 +423,53 @@ class AudioDeviceManager:
     def _create_loopback_device_from_pyaudiowpatch(self, loopback_info: Dict[str, Any]) -> Optional[AudioDevice]:
         """Create a loopback device from PyAudioWPatch info"""
         try:
+            # Hoist repeated dict lookups into locals
+            index = loopback_info['index']
+            name = loopback_info['name']
+            max_channels = loopback_info['maxInputChannels']
+            default_rate = float(loopback_info['defaultSampleRate'])
+
             # Generate unique ID
-            device_id = f"loopback_{loopback_info['index']}_{loopback_info['name'].replace(' ', '_')}"
-            
+            device_id = f"loopback_{index}_{name.translate(_SPACE_TO_UNDER)}"
+
             # Get supported formats (use common formats for loopback)
             supported_formats = [
                 AudioFormat(
-                    sample_rate=float(loopback_info['defaultSampleRate']),
-                    channel_count=loopback_info['maxInputChannels'],
+                    sample_rate=default_rate,
+                    channel_count=max_channels,
                     bit_depth=16,
                     is_interleaved=True,
                     is_float=False
                 ),
                 AudioFormat(
-                    sample_rate=float(loopback_info['defaultSampleRate']),
-                    channel_count=loopback_info['maxInputChannels'],
+                    sample_rate=default_rate,
+                    channel_count=max_channels,
                     bit_depth=32,
                     is_interleaved=True,
                     is_float=True
                 )
             ]
-            
+
             # Get host API
             host_api_info = self._pyaudio.get_host_api_info_by_index(loopback_info['hostApi'])
             host_api = self._get_device_api(host_api_info['name'])
-            
+
             # Create capabilities
             capabilities = DeviceCapabilities(
                 hardware_monitoring=False,
                 exclusive_mode=False,
                 min_latency=loopback_info.get('defaultLowInputLatency', 0.020),
-                max_channels=loopback_info['maxInputChannels'],
-                sample_rates=[float(loopback_info['defaultSampleRate'])],
+                max_channels=max_channels,
+                sample_rates=[default_rate],
                 supports_loopback=True
             )
-            
+
             return AudioDevice(
                 id=device_id,
-                name=loopback_info['name'],
+                name=name,
                 manufacturer=None,
                 type=DeviceType.LOOPBACK,
-                device_index=loopback_info['index'],  # PyAudioWPatch index
+                device_index=index,  # PyAudioWPatch index
                 wasapi_id=None,
                 supported_formats=supported_formats,
                 is_default=False,
@@ -356,7 +478,7 @@ class AudioDeviceManager:
                 host_api=host_api
             )
         except Exception as e:
-            print(f"Error creating loopback device: {e}")
+            self._report_error("_create_loopback_device_from_pyaudiowpatch", e)
             return None
     
     def _get_device_api(self, api_name: str) -> DeviceAPI:
@@ -406,39 +528,55 @@ class AudioDeviceManager:
     
     async def _monitor_devices(self):
         """Monitor for device changes"""
-        previous_devices = set()
-        
+        previous_by_id: Dict[str, AudioDevice] = {}
+        previous_fingerprint: Optional[int] = None
+
         while True:
             try:
                 # Get current devices
                 self._refresh_device_list()
-                current_devices = {d.id for d in self._cached_devices}
-                
-                # Check for changes
-                added = current_devices - previous_devices
-                removed = previous_devices - current_devices
-                
+                current_by_id = {d.id: d for d in self._all_devices()}
+
+                # Short-circuit the diff when nothing changed (the common
+                # case for a stable device set polled every 2 seconds).
+                # is_default is part of the fingerprint so default-device
+                # switches still get through.
+                fingerprint = hash(tuple(sorted(
+                    (device_id, d.is_default) for device_id, d in current_by_id.items()
+                )))
+                if fingerprint == previous_fingerprint:
+                    await asyncio.sleep(2.0)
+                    continue
+                previous_fingerprint = fingerprint
+
                 # Notify handler
                 if self._device_change_handler:
-                    for device_id in added:
-                        device = self.get_device_by_id(device_id)
-                        if device:
+                    for device_id, device in current_by_id.items():
+                        previous = previous_by_id.get(device_id)
+                        if previous is None:
                             self._device_change_handler(DeviceChange(
                                 event=DeviceChangeEvent.DEVICE_ADDED,
                                 device=device,
                                 device_type=device.type
                             ))
-                    
-                    for device_id in removed:
-                        self._device_change_handler(DeviceChange(
-                            event=DeviceChangeEvent.DEVICE_REMOVED,
-                            device=None,
-                            device_type=None
-                        ))
-                
-                previous_devices = current_devices
-                
+                        elif previous.is_default != device.is_default:
+                            self._device_change_handler(DeviceChange(
+                                event=DeviceChangeEvent.DEFAULT_CHANGED,
+                                device=device,
+                                device_type=device.type
+                            ))
+
+                    for device_id in previous_by_id:
+                        if device_id not in current_by_id:
+                            self._device_change_handler(DeviceChange(
+                                event=DeviceChangeEvent.DEVICE_REMOVED,
+                                device=None,
+                                device_type=None
+                            ))
+
+                previous_by_id = current_by_id
+
             except Exception as e:
-                print(f"Error monitoring devices: {e}")
-            
+                self._report_error("_monitor_devices", e)
+
             await asyncio.sleep(2.0)  # Check every 2 seconds
\ No newline at end of file
@@ -2,11 +2,26 @@
 AudioCaptureError - Comprehensive error types for the Windows audio capture library
 """
 
-from datetime import datetime
-from typing import Dict, Any, Optional, Callable
+from __future__ import annotations
+
+from typing import Dict, Any, Optional, Callable, TYPE_CHECKING
 from enum import Enum, auto
-import uuid
-import time
+import functools
+import logging
+import sys
+
+if TYPE_CHECKING:
+    import uuid
+
+logger = logging.getLogger(__name__)
+
+# Shared help-anchor strings. Multi-character anchors are not guaranteed
+# to be interned by the compiler; one interned instance per anchor means
+# every class-attribute read returns the same object.
+_HELP_DEVICES = sys.intern("devices")
+_HELP_PERMISSIONS = sys.intern("permissions")
+_HELP_FORMATS = sys.intern("formats")
+_HELP_PERFORMANCE = sys.intern("performance")
 
 
 class ErrorRecoveryStrategy(Enum):
@@ -19,158 +34,138 @@ class ErrorRecoveryStrategy(Enum):
 
 class AudioCaptureError(Exception):
     """Base exception class for audio capture errors"""
-    
+
+    __slots__ = ('message', 'details')
+
     def __init__(self, message: str, details: Optional[str] = None):
         self.message = message
         self.details = details
         super().__init__(self.message)
     
-    @property
-    def failure_reason(self) -> Optional[str]:
-        """Get the failure reason for this error"""
-        return None
-    
-    @property
-    def recovery_suggestion(self) -> Optional[str]:
-        """Get recovery suggestion for this error"""
-        return None
-    
-    @property
-    def help_anchor(self) -> Optional[str]:
-        """Get help documentation anchor for this error"""
-        return None
+    # Per-class metadata, overridden by subclasses. Plain class
+    # attributes rather than properties: the values are immutable per
+    # class and an MRO attribute load skips the descriptor protocol.
+    failure_reason: Optional[str] = None
+    recovery_suggestion: Optional[str] = None
+    help_anchor: Optional[str] = None
 
 
 # Device Errors
 class DeviceNotFoundError(AudioCaptureError):
     """Audio device not found"""
+    __slots__ = ('device_name',)
     def __init__(self, device_name: str):
         super().__init__(f"Audio device '{device_name}' not found")
         self.device_name = device_name
     
-    @property
-    def help_anchor(self) -> str:
-        return "devices"
+    help_anchor = _HELP_DEVICES
 
 
 class DeviceEnumerationFailedError(AudioCaptureError):
     """Failed to enumerate audio devices"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Failed to enumerate audio devices")
     
-    @property
-    def help_anchor(self) -> str:
-        return "devices"
+    help_anchor = _HELP_DEVICES
 
 
 class DeviceSelectionFailedError(AudioCaptureError):
     """Failed to select audio device"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Failed to select audio device")
     
-    @property
-    def help_anchor(self) -> str:
-        return "devices"
+    help_anchor = _HELP_DEVICES
 
 
 class DevicePropertyReadFailedError(AudioCaptureError):
     """Failed to read device properties"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Failed to read device properties")
 
 
 class InvalidDeviceError(AudioCaptureError):
     """Invalid device"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Invalid device: {reason}")
         self.reason = reason
     
-    @property
-    def help_anchor(self) -> str:
-        return "devices"
+    help_anchor = _HELP_DEVICES
 
 
 class DeviceDisconnectedError(AudioCaptureError):
     """Device was disconnected"""
+    __slots__ = ('device_name',)
     def __init__(self, device_name: str):
         super().__init__(f"Device '{device_name}' was disconnected")
         self.device_name = device_name
     
-    @property
-    def recovery_suggestion(self) -> str:
-        return "Reconnect the audio device or select a different device"
+    recovery_suggestion = "Reconnect the audio device or select a different device"
     
-    @property
-    def help_anchor(self) -> str:
-        return "devices"
+    help_anchor = _HELP_DEVICES
 
 
 class DeviceInUseError(AudioCaptureError):
     """Device is already in use"""
+    __slots__ = ('device_name',)
     def __init__(self, device_name: str):
         super().__init__(f"Device '{device_name}' is already in use")
         self.device_name = device_name
     
-    @property
-    def help_anchor(self) -> str:
-        return "devices"
+    help_anchor = _HELP_DEVICES
 
 
 # Permission Errors
 class PermissionDeniedError(AudioCaptureError):
     """Permission denied"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Permission denied")
 
 
 class AudioLoopbackPermissionError(AudioCaptureError):
     """System audio loopback permission required"""
+    __slots__ = ()
+    _DEFAULT_MSG = (
+        "System audio loopback permission is required. "
+        "This feature requires Windows 10 version 1803 or later"
+    )
+
     def __init__(self, message=None):
-        if message:
-            super().__init__(message)
-        else:
-            super().__init__(
-                "System audio loopback permission is required. "
-                "This feature requires Windows 10 version 1803 or later"
-            )
+        super().__init__(message or self._DEFAULT_MSG)
     
-    @property
-    def failure_reason(self) -> str:
-        return "The app needs access to system audio"
+    failure_reason = "The app needs access to system audio"
     
-    @property
-    def recovery_suggestion(self) -> str:
-        return "Ensure you're running Windows 10 version 1803 or later and have appropriate permissions"
+    recovery_suggestion = "Ensure you're running Windows 10 version 1803 or later and have appropriate permissions"
     
-    @property
-    def help_anchor(self) -> str:
-        return "permissions"
+    help_anchor = _HELP_PERMISSIONS
 
 
 class MicrophonePermissionError(AudioCaptureError):
     """Microphone permission required"""
-    def __init__(self):
-        super().__init__(
-            "Microphone permission is required. "
-            "Please grant permission in Windows Settings > Privacy > Microphone"
-        )
+    __slots__ = ()
+    _DEFAULT_MSG = (
+        "Microphone permission is required. "
+        "Please grant permission in Windows Settings > Privacy > Microphone"
+    )
+
+    def __init__(self, message=None):
+        super().__init__(message or self._DEFAULT_MSG)
     
-    @property
-    def failure_reason(self) -> str:
-        return "The app needs access to microphone input"
+    failure_reason = "The app needs access to microphone input"
     
-    @property
-    def recovery_suggestion(self) -> str:
-        return "Open Windows Settings and grant Microphone permission to this app"
+    recovery_suggestion = "Open Windows Settings and grant Microphone permission to this app"
     
-    @property
-    def help_anchor(self) -> str:
-        return "permissions"
+    help_anchor = _HELP_PERMISSIONS
 
 
 # Session Errors
 class SessionNotFoundError(AudioCaptureError):
     """Session not found"""
+    __slots__ = ('session_id',)
     def __init__(self, session_id: uuid.UUID):
         super().__init__(f"Session with ID {session_id} not found")
         self.session_id = session_id
@@ -178,24 +173,28 @@ class SessionNotFoundError(AudioCaptureError):
 
 class InvalidStateError(AudioCaptureError):
     """Invalid session state"""
+    __slots__ = ()
     def __init__(self, message: str):
         super().__init__(f"Invalid session state: {message}")
 
 
 class SessionAlreadyActiveError(AudioCaptureError):
     """Session is already active"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Session is already active")
 
 
 class SessionNotActiveError(AudioCaptureError):
     """Session is not active"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Session is not active")
 
 
 class SessionStartFailedError(AudioCaptureError):
     """Failed to start session"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Failed to start session: {reason}")
         self.reason = reason
@@ -204,60 +203,56 @@ class SessionStartFailedError(AudioCaptureError):
 # Format Errors
 class UnsupportedFormatError(AudioCaptureError):
     """Unsupported audio format"""
+    __slots__ = ('format_desc',)
     def __init__(self, format_desc: str):
         super().__init__(f"Unsupported audio format: {format_desc}")
         self.format_desc = format_desc
     
-    @property
-    def help_anchor(self) -> str:
-        return "formats"
+    help_anchor = _HELP_FORMATS
 
 
 class FormatConversionFailedError(AudioCaptureError):
     """Format conversion failed"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Format conversion failed: {reason}")
         self.reason = reason
     
-    @property
-    def help_anchor(self) -> str:
-        return "formats"
+    help_anchor = _HELP_FORMATS
 
 
 class FormatMismatchError(AudioCaptureError):
     """Audio format mismatch"""
+    __slots__ = ()
     def __init__(self, details: str):
         super().__init__(f"Audio format mismatch: {details}")
         self.details = details
     
-    @property
-    def recovery_suggestion(self) -> str:
-        return "Check that all audio components are using compatible formats"
+    recovery_suggestion = "Check that all audio components are using compatible formats"
     
-    @property
-    def help_anchor(self) -> str:
-        return "formats"
+    help_anchor = _HELP_FORMATS
 
 
 class FormatNegotiationFailedError(AudioCaptureError):
     """Failed to negotiate compatible audio format"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Failed to negotiate compatible audio format")
     
-    @property
-    def help_anchor(self) -> str:
-        return "formats"
+    help_anchor = _HELP_FORMATS
 
 
 # Output Errors
 class OutputNotConfiguredError(AudioCaptureError):
     """Output is not configured"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Output is not configured")
 
 
 class OutputConfigurationFailedError(AudioCaptureError):
     """Output configuration failed"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Output configuration failed: {reason}")
         self.reason = reason
@@ -265,6 +260,7 @@ class OutputConfigurationFailedError(AudioCaptureError):
 
 class OutputProcessingFailedError(AudioCaptureError):
     """Output processing failed"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Output processing failed: {reason}")
         self.reason = reason
@@ -272,6 +268,7 @@ class OutputProcessingFailedError(AudioCaptureError):
 
 class FileWriteFailedError(AudioCaptureError):
     """File write failed"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"File write failed: {reason}")
         self.reason = reason
@@ -279,6 +276,7 @@ class FileWriteFailedError(AudioCaptureError):
 
 class StreamingFailedError(AudioCaptureError):
     """Streaming failed"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Streaming failed: {reason}")
         self.reason = reason
@@ -287,44 +285,42 @@ class StreamingFailedError(AudioCaptureError):
 # Buffer Errors
 class BufferAllocationFailedError(AudioCaptureError):
     """Failed to allocate audio buffer"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Failed to allocate audio buffer")
 
 
 class BufferOverflowError(AudioCaptureError):
     """Audio buffer overflow"""
-    def __init__(self):
-        super().__init__("Audio buffer overflow")
+    __slots__ = ()
+    _DEFAULT_MSG = "Audio buffer overflow"
+
+    def __init__(self, message=None):
+        super().__init__(message or self._DEFAULT_MSG)
     
-    @property
-    def failure_reason(self) -> str:
-        return "Audio processing can't keep up with input rate"
+    failure_reason = "Audio processing can't keep up with input rate"
     
-    @property
-    def recovery_suggestion(self) -> str:
-        return "Try reducing the audio quality or closing other applications"
+    recovery_suggestion = "Try reducing the audio quality or closing other applications"
     
-    @property
-    def help_anchor(self) -> str:
-        return "performance"
+    help_anchor = _HELP_PERFORMANCE
 
 
 class BufferUnderrunError(AudioCaptureError):
     """Audio buffer underrun"""
-    def __init__(self):
-        super().__init__("Audio buffer underrun")
+    __slots__ = ()
+    _DEFAULT_MSG = "Audio buffer underrun"
+
+    def __init__(self, message=None):
+        super().__init__(message or self._DEFAULT_MSG)
     
-    @property
-    def failure_reason(self) -> str:
-        return "Audio input is not providing data fast enough"
+    failure_reason = "Audio input is not providing data fast enough"
     
-    @property
-    def help_anchor(self) -> str:
-        return "performance"
+    help_anchor = _HELP_PERFORMANCE
 
 
 class InvalidBufferSizeError(AudioCaptureError):
     """Invalid buffer size"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Invalid buffer size")
 
@@ -332,26 +328,25 @@ class InvalidBufferSizeError(AudioCaptureError):
 # System Errors
 class SystemResourcesExhaustedError(AudioCaptureError):
     """System resources exhausted"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("System resources exhausted")
     
-    @property
-    def failure_reason(self) -> str:
-        return "Not enough CPU or memory available"
+    failure_reason = "Not enough CPU or memory available"
     
-    @property
-    def recovery_suggestion(self) -> str:
-        return "Close other applications to free up system resources"
+    recovery_suggestion = "Close other applications to free up system resources"
 
 
 class MemoryAllocationFailedError(AudioCaptureError):
     """Memory allocation failed"""
+    __slots__ = ()
     def __init__(self):
         super().__init__("Memory allocation failed")
 
 
 class AudioEngineStartFailedError(AudioCaptureError):
     """Audio engine failed to start"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Audio engine failed to start: {reason}")
         self.reason = reason
@@ -359,6 +354,7 @@ class AudioEngineStartFailedError(AudioCaptureError):
 
 class UnknownError(AudioCaptureError):
     """Unknown error"""
+    __slots__ = ()
     def __init__(self, message: str):
         super().__init__(f"Unknown error: {message}")
 
@@ -366,6 +362,7 @@ class UnknownError(AudioCaptureError):
 # Network Errors
 class NetworkConnectionFailedError(AudioCaptureError):
     """Network connection failed"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Network connection failed: {reason}")
         self.reason = reason
@@ -373,6 +370,7 @@ class NetworkConnectionFailedError(AudioCaptureError):
 
 class StreamingProtocolError(AudioCaptureError):
     """Streaming protocol error"""
+    __slots__ = ('reason',)
     def __init__(self, reason: str):
         super().__init__(f"Streaming protocol error: {reason}")
         self.reason = reason
@@ -381,6 +379,7 @@ class StreamingProtocolError(AudioCaptureError):
 # Windows-specific Errors
 class WASAPIError(AudioCaptureError):
     """Windows Audio Session API error"""
+    __slots__ = ('error_code',)
     def __init__(self, error_code: int, message: str):
         super().__init__(f"WASAPI error {error_code}: {message}")
         self.error_code = error_code
@@ -388,6 +387,7 @@ class WASAPIError(AudioCaptureError):
 
 class MMEError(AudioCaptureError):
     """Windows Multimedia Extension error"""
+    __slots__ = ('error_code',)
     def __init__(self, error_code: int, message: str):
         super().__init__(f"MME error {error_code}: {message}")
         self.error_code = error_code
@@ -395,14 +395,55 @@ class MMEError(AudioCaptureError):
 
 class DirectSoundError(AudioCaptureError):
     """DirectSound error"""
+    __slots__ = ('error_code',)
     def __init__(self, error_code: int, message: str):
         super().__init__(f"DirectSound error {error_code}: {message}")
         self.error_code = error_code
 
 
+# Recovery strategies keyed by exception type. Resolution walks the MRO
+# once per type and is cached, replacing the per-error isinstance chain
+# with a single dict hit.
+_STRATEGY_TABLE = {
+    DeviceDisconnectedError: (ErrorRecoveryStrategy.RETRY, {"max_attempts": 3, "delay": 1.0}),
+    BufferOverflowError: (ErrorRecoveryStrategy.IGNORE, {}),
+    BufferUnderrunError: (ErrorRecoveryStrategy.IGNORE, {}),
+    SessionStartFailedError: (ErrorRecoveryStrategy.RETRY, {"max_attempts": 2, "delay": 0.5}),
+}
+_DEFAULT_STRATEGY = (ErrorRecoveryStrategy.FAIL, {})
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_strategy(error_type: type) -> tuple[ErrorRecoveryStrategy, dict]:
+    """Resolve the recovery strategy for an exception type via its MRO"""
+    for klass in error_type.__mro__:
+        entry = _STRATEGY_TABLE.get(klass)
+        if entry is not None:
+            return entry
+    return _DEFAULT_STRATEGY
+
+
 class ErrorHandler:
     """Error handler with recovery strategies"""
     
+    @staticmethod
+    def handle_sync(
+        error: Exception,
+        strategy: ErrorRecoveryStrategy = ErrorRecoveryStrategy.FAIL,
+        max_attempts: int = 3,
+        delay: float = 1.0
+    ):
+        """Handle error synchronously (RETRY/IGNORE/FAIL strategies)"""
+        print(f"Error occurred: {error}")
+
+        if strategy == ErrorRecoveryStrategy.IGNORE:
+            # Log and continue
+            logger.warning("Ignoring error: %s", error)
+        else:
+            # RETRY (retry logic is implemented by caller) and FAIL both
+            # raise through
+            raise error
+
     @staticmethod
     async def handle(
         error: Exception,
@@ -412,36 +453,22 @@ class ErrorHandler:
         fallback_action: Optional[Callable] = None
     ):
         """Handle error with recovery strategy"""
-        print(f"Error occurred: {error}")
-        
-        if strategy == ErrorRecoveryStrategy.RETRY:
-            # Retry logic would be implemented by caller
-            raise error
-            
-        elif strategy == ErrorRecoveryStrategy.FALLBACK:
+        # Only the FALLBACK branch actually needs to await anything; the
+        # rest goes through the synchronous path without building extra
+        # coroutine machinery.
+        if strategy == ErrorRecoveryStrategy.FALLBACK:
+            print(f"Error occurred: {error}")
             if fallback_action:
                 await fallback_action()
             else:
                 raise error
-                
-        elif strategy == ErrorRecoveryStrategy.IGNORE:
-            # Log and continue
-            print(f"Ignoring error: {error}")
-            
-        elif strategy == ErrorRecoveryStrategy.FAIL:
-            raise error
+        else:
+            ErrorHandler.handle_sync(error, strategy, max_attempts, delay)
     
     @staticmethod
     def suggested_strategy(error: Exception) -> tuple[ErrorRecoveryStrategy, dict]:
         """Get suggested recovery strategy for error"""
-        if isinstance(error, DeviceDisconnectedError):
-            return ErrorRecoveryStrategy.RETRY, {"max_attempts": 3, "delay": 1.0}
-        elif isinstance(error, (BufferOverflowError, BufferUnderrunError)):
-            return ErrorRecoveryStrategy.IGNORE, {}
-        elif isinstance(error, SessionStartFailedError):
-            return ErrorRecoveryStrategy.RETRY, {"max_attempts": 2, "delay": 0.5}
-        else:
-            return ErrorRecoveryStrategy.FAIL, {}
+        return _resolve_strategy(type(error))
 
 
 class ErrorContext:
@@ -454,31 +481,57 @@ class ErrorContext:
         operation: str = "",
         additional_info: Optional[Dict[str, Any]] = None
     ):
+        from time import monotonic_ns
+
         self.error = error
-        self.timestamp = datetime.now()
+        # Stamp with the monotonic clock (fast, high-resolution) and
+        # convert to a datetime only if the timestamp is actually read
+        self._timestamp_ns = monotonic_ns()
+        self._timestamp = None
         self.session_id = session_id
         self.operation = operation
         self.additional_info = additional_info or {}
-    
+        self._cached_report: Optional[str] = None
+
+    @property
+    def timestamp(self):
+        """Wall-clock timestamp, derived lazily from the monotonic
+        stamp"""
+        if self._timestamp is None:
+            from datetime import datetime
+            from time import monotonic_ns, time_ns
+
+            wall_ns = time_ns() - (monotonic_ns() - self._timestamp_ns)
+            self._timestamp = datetime.fromtimestamp(wall_ns / 1e9)
+        return self._timestamp
+
     def report(self) -> str:
         """Create detailed error report"""
-        report = f"""Audio Capture Error Report
-========================
-Timestamp: {self.timestamp}
-Operation: {self.operation}
-Error: {self.error}
-"""
-        
+        # Context fields are fixed after construction, so the rendered
+        # report is built once and reused.
+        if self._cached_report is not None:
+            return self._cached_report
+
+        parts = [
+            "Audio Capture Error Report",
+            "========================",
+            f"Timestamp: {self.timestamp.isoformat(sep=' ')}",
+            f"Operation: {self.operation}",
+            f"Error: {self.error}",
+            "",
+        ]
+
         if self.session_id:
-            report += f"\nSession ID: {self.session_id}"
-        
+            parts.append(f"Session ID: {self.session_id}")
+
         if self.additional_info:
-            report += "\n\nAdditional Information:"
-            for key, value in self.additional_info.items():
-                report += f"\n  {key}: {value}"
-        
+            parts.append("\nAdditional Information:")
+            parts.extend(f"  {key}: {value}"
+                         for key, value in self.additional_info.items())
+
         if isinstance(self.error, AudioCaptureError):
             if self.error.recovery_suggestion:
-                report += f"\n\nRecovery Suggestion: {self.error.recovery_suggestion}"
-        
-        return report
\ No newline at end of file
+                parts.append(f"\nRecovery Suggestion: {self.error.recovery_suggestion}")
+
+        self._cached_report = "\n".join(parts)
+        return self._cached_report
\ No newline at end of file
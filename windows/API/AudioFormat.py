@@ -1,386 +1,545 @@
-"""
-AudioFormat - Represents an audio format configuration
-
-This module encapsulates all parameters needed to describe an audio format,
-including sample rate, channel configuration, bit depth, and data layout.
-"""
-
-from dataclasses import dataclass
-from datetime import datetime
-from enum import Enum, auto
-from typing import Optional, Tuple
-import numpy as np
-
-
-class AudioCommonFormat(Enum):
-    """Common audio format types"""
-    PCM_FORMAT_INT16 = auto()
-    PCM_FORMAT_INT32 = auto()
-    PCM_FORMAT_FLOAT32 = auto()
-    PCM_FORMAT_FLOAT64 = auto()
-
-
-@dataclass(frozen=True)
-class AudioFormat:
-    """
-    Represents an audio format configuration.
-    
-    Attributes:
-        sample_rate: Sample rate in Hz
-        channel_count: Number of channels
-        bit_depth: Bit depth (16, 24, 32, 64)
-        is_interleaved: Whether samples are interleaved
-        is_float: Whether format uses floating point
-    """
-    sample_rate: float
-    channel_count: int
-    bit_depth: int
-    is_interleaved: bool
-    is_float: bool = False
-    
-    def __post_init__(self):
-        """Validate and adjust format parameters"""
-        if self.bit_depth == 32 and not self.is_float:
-            # Default to float for 32-bit
-            object.__setattr__(self, 'is_float', True)
-    
-    @property
-    def bytes_per_frame(self) -> int:
-        """Calculate bytes per frame"""
-        return (self.bit_depth // 8) * (self.channel_count if self.is_interleaved else 1)
-    
-    @property
-    def bytes_per_packet(self) -> int:
-        """Calculate bytes per packet"""
-        return self.bytes_per_frame * (1 if self.is_interleaved else self.channel_count)
-    
-    @property
-    def common_format(self) -> AudioCommonFormat:
-        """Get common format type"""
-        if self.bit_depth == 16 and not self.is_float:
-            return AudioCommonFormat.PCM_FORMAT_INT16
-        elif self.bit_depth == 32 and self.is_float:
-            return AudioCommonFormat.PCM_FORMAT_FLOAT32
-        elif self.bit_depth == 32 and not self.is_float:
-            return AudioCommonFormat.PCM_FORMAT_INT32
-        elif self.bit_depth == 64 and self.is_float:
-            return AudioCommonFormat.PCM_FORMAT_FLOAT64
-        elif self.bit_depth == 24 and not self.is_float:
-            # 24-bit is typically converted to 32-bit
-            return AudioCommonFormat.PCM_FORMAT_INT32
-        else:
-            return AudioCommonFormat.PCM_FORMAT_FLOAT32
-    
-    @property
-    def numpy_dtype(self) -> np.dtype:
-        """Get NumPy dtype for this format"""
-        if self.bit_depth == 16 and not self.is_float:
-            return np.dtype('int16')
-        elif self.bit_depth == 32 and self.is_float:
-            return np.dtype('float32')
-        elif self.bit_depth == 32 and not self.is_float:
-            return np.dtype('int32')
-        elif self.bit_depth == 64 and self.is_float:
-            return np.dtype('float64')
-        else:
-            return np.dtype('float32')
-    
-    def is_compatible(self, other: 'AudioFormat') -> bool:
-        """Check if format is compatible with another format"""
-        return (self.sample_rate == other.sample_rate and
-                self.channel_count == other.channel_count and
-                self.bit_depth == other.bit_depth and
-                self.is_interleaved == other.is_interleaved and
-                self.is_float == other.is_float)
-    
-    def requires_conversion(self, other: 'AudioFormat') -> bool:
-        """Check if format requires conversion to another format"""
-        return not self.is_compatible(other)
-    
-    @property
-    def description(self) -> str:
-        """Human-readable description"""
-        format_type = "Float" if self.is_float else "Int"
-        layout = "Interleaved" if self.is_interleaved else "Non-interleaved"
-        return f"{int(self.sample_rate)}Hz, {self.channel_count}ch, {self.bit_depth}-bit {format_type}, {layout}"
-    
-    # Common format presets
-    @classmethod
-    def default_format(cls) -> 'AudioFormat':
-        """Default capture format (48kHz, 2ch, 32-bit float, non-interleaved)"""
-        return cls(
-            sample_rate=48000.0,
-            channel_count=2,
-            bit_depth=32,
-            is_interleaved=False,
-            is_float=True
-        )
-    
-    @classmethod
-    def cd_quality(cls) -> 'AudioFormat':
-        """CD quality format (44.1kHz, 2ch, 16-bit int, interleaved)"""
-        return cls(
-            sample_rate=44100.0,
-            channel_count=2,
-            bit_depth=16,
-            is_interleaved=True,
-            is_float=False
-        )
-    
-    @classmethod
-    def standard_wav(cls) -> 'AudioFormat':
-        """Standard WAV format (48kHz, 2ch, 16-bit int, interleaved)"""
-        return cls(
-            sample_rate=48000.0,
-            channel_count=2,
-            bit_depth=16,
-            is_interleaved=True,
-            is_float=False
-        )
-    
-    @classmethod
-    def high_quality(cls) -> 'AudioFormat':
-        """High quality format (96kHz, 2ch, 24-bit int, interleaved)"""
-        return cls(
-            sample_rate=96000.0,
-            channel_count=2,
-            bit_depth=24,
-            is_interleaved=True,
-            is_float=False
-        )
-
-
-class FormatPriority(Enum):
-    """Format negotiation priority"""
-    QUALITY = auto()        # Prefer highest quality
-    COMPATIBILITY = auto()  # Prefer most compatible format
-    PERFORMANCE = auto()    # Prefer least conversion
-    BALANCED = auto()       # Balance all factors
-
-
-@dataclass
-class FormatPreferences:
-    """Format negotiation preferences"""
-    priority: FormatPriority
-    max_sample_rate: Optional[float] = None
-    max_bit_depth: Optional[int] = None
-    prefer_interleaved: bool = True
-    prefer_float: bool = False
-    
-    @classmethod
-    def default(cls) -> 'FormatPreferences':
-        """Default preferences"""
-        return cls(
-            priority=FormatPriority.BALANCED,
-            max_sample_rate=None,
-            max_bit_depth=None,
-            prefer_interleaved=True,
-            prefer_float=False
-        )
-    
-    @classmethod
-    def high_quality(cls) -> 'FormatPreferences':
-        """High quality preferences"""
-        return cls(
-            priority=FormatPriority.QUALITY,
-            max_sample_rate=192000.0,
-            max_bit_depth=32,
-            prefer_interleaved=False,
-            prefer_float=True
-        )
-    
-    @classmethod
-    def performance(cls) -> 'FormatPreferences':
-        """Performance preferences"""
-        return cls(
-            priority=FormatPriority.PERFORMANCE,
-            max_sample_rate=48000.0,
-            max_bit_depth=16,
-            prefer_interleaved=True,
-            prefer_float=False
-        )
-
-
-class AudioFormatNegotiator:
-    """Handles format negotiation and conversion"""
-    
-    @staticmethod
-    def negotiate(
-        source: AudioFormat,
-        destination: AudioFormat,
-        preferences: FormatPreferences = None
-    ) -> AudioFormat:
-        """Find best common format between source and destination"""
-        if preferences is None:
-            preferences = FormatPreferences.default()
-        
-        # If formats match, no negotiation needed
-        if source.is_compatible(destination):
-            return source
-        
-        # Apply preferences
-        if preferences.priority == FormatPriority.QUALITY:
-            # Prefer higher sample rate and bit depth
-            return AudioFormat(
-                sample_rate=max(source.sample_rate, destination.sample_rate),
-                channel_count=max(source.channel_count, destination.channel_count),
-                bit_depth=max(source.bit_depth, destination.bit_depth),
-                is_interleaved=destination.is_interleaved,
-                is_float=source.is_float or destination.is_float
-            )
-        
-        elif preferences.priority == FormatPriority.COMPATIBILITY:
-            # Prefer destination format for maximum compatibility
-            return destination
-        
-        elif preferences.priority == FormatPriority.PERFORMANCE:
-            # Prefer source format to minimize conversion
-            return source
-        
-        else:  # BALANCED
-            # Find middle ground
-            return AudioFormat(
-                sample_rate=destination.sample_rate,  # Use destination sample rate
-                channel_count=min(source.channel_count, destination.channel_count),
-                bit_depth=destination.bit_depth,
-                is_interleaved=destination.is_interleaved,
-                is_float=destination.is_float
-            )
-    
-    @staticmethod
-    def can_convert(source: AudioFormat, destination: AudioFormat) -> bool:
-        """Check if direct conversion is possible"""
-        # Sample rate conversion is supported
-        if source.sample_rate != destination.sample_rate:
-            return True
-        
-        # Channel count mismatch - check if downmix/upmix is possible
-        if source.channel_count != destination.channel_count:
-            if source.channel_count > 2 and destination.channel_count == 2:
-                return True  # Can downmix to stereo
-            if source.channel_count == 1 and destination.channel_count == 2:
-                return True  # Can upmix mono to stereo
-        
-        # Format conversion is generally possible
-        return True
-    
-    @staticmethod
-    def conversion_complexity(source: AudioFormat, destination: AudioFormat) -> float:
-        """Get conversion complexity score (0.0 = simple, 1.0 = complex)"""
-        complexity = 0.0
-        
-        # Sample rate conversion
-        if source.sample_rate != destination.sample_rate:
-            complexity += 0.3
-        
-        # Channel conversion
-        if source.channel_count != destination.channel_count:
-            complexity += 0.2
-        
-        # Bit depth conversion
-        if source.bit_depth != destination.bit_depth:
-            complexity += 0.2
-        
-        # Float/Int conversion
-        if source.is_float != destination.is_float:
-            complexity += 0.2
-        
-        # Interleaving conversion
-        if source.is_interleaved != destination.is_interleaved:
-            complexity += 0.1
-        
-        return min(complexity, 1.0)
-
-
-class AudioBuffer:
-    """Audio buffer wrapper for format-aware operations"""
-    
-    def __init__(
-        self,
-        data: np.ndarray,
-        format: AudioFormat,
-        timestamp: Optional[datetime] = None
-    ):
-        """
-        Initialize audio buffer.
-        
-        Args:
-            data: NumPy array containing audio data
-            format: Audio format specification
-            timestamp: Timestamp of buffer capture
-        """
-        self.data = data
-        self.format = format
-        self.timestamp = timestamp or datetime.now()
-        
-        # Validate data shape
-        expected_shape = self._calculate_expected_shape()
-        if self.data.shape != expected_shape and len(expected_shape) > 0:
-            raise ValueError(
-                f"Data shape {self.data.shape} doesn't match format. "
-                f"Expected {expected_shape}"
-            )
-    
-    def _calculate_expected_shape(self) -> Tuple[int, ...]:
-        """Calculate expected data shape based on format"""
-        if len(self.data.shape) == 1:
-            # 1D array for mono or interleaved
-            return self.data.shape
-        
-        if self.format.is_interleaved:
-            # Interleaved: (frames, channels)
-            if len(self.data.shape) == 2:
-                return self.data.shape
-        else:
-            # Non-interleaved: (channels, frames)
-            if len(self.data.shape) == 2:
-                return self.data.shape
-        
-        return tuple()
-    
-    @property
-    def frame_count(self) -> int:
-        """Get number of audio frames"""
-        if self.format.is_interleaved:
-            return self.data.shape[0] if len(self.data.shape) > 0 else 0
-        else:
-            return self.data.shape[1] if len(self.data.shape) > 1 else len(self.data)
-    
-    @property
-    def duration(self) -> float:
-        """Get duration in seconds"""
-        return self.frame_count / self.format.sample_rate
-    
-    def to_interleaved(self) -> 'AudioBuffer':
-        """Convert to interleaved format"""
-        if self.format.is_interleaved:
-            return self
-        
-        # Transpose data from (channels, frames) to (frames, channels)
-        interleaved_data = self.data.T
-        interleaved_format = AudioFormat(
-            sample_rate=self.format.sample_rate,
-            channel_count=self.format.channel_count,
-            bit_depth=self.format.bit_depth,
-            is_interleaved=True,
-            is_float=self.format.is_float
-        )
-        
-        return AudioBuffer(interleaved_data, interleaved_format, self.timestamp)
-    
-    def to_non_interleaved(self) -> 'AudioBuffer':
-        """Convert to non-interleaved format"""
-        if not self.format.is_interleaved:
-            return self
-        
-        # Transpose data from (frames, channels) to (channels, frames)
-        non_interleaved_data = self.data.T
-        non_interleaved_format = AudioFormat(
-            sample_rate=self.format.sample_rate,
-            channel_count=self.format.channel_count,
-            bit_depth=self.format.bit_depth,
-            is_interleaved=False,
-            is_float=self.format.is_float
-        )
-        
-        return AudioBuffer(non_interleaved_data, non_interleaved_format, self.timestamp)
\ No newline at end of file
+"""
+AudioFormat - Represents an audio format configuration
+
+This module encapsulates all parameters needed to describe an audio format,
+including sample rate, channel configuration, bit depth, and data layout.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum, auto
+from typing import Optional
+import time
+import numpy as np
+
+# Anchor for converting monotonic capture timestamps to wall-clock time.
+# monotonic_ns() is both faster and higher-resolution than datetime.now()
+# (which sits at 1-16 ms granularity on Windows), so buffers stamp with
+# the monotonic clock and convert lazily when a datetime is actually read.
+_MONOTONIC_EPOCH_NS = time.time_ns() - time.monotonic_ns()
+
+
+class AudioCommonFormat(Enum):
+    """Common audio format types"""
+    PCM_FORMAT_INT16 = auto()
+    PCM_FORMAT_INT32 = auto()
+    PCM_FORMAT_FLOAT32 = auto()
+    PCM_FORMAT_FLOAT64 = auto()
+
+
+# Dispatch tables keyed by (bit_depth, is_float); both properties used
+# to re-run the same five-branch cascade. 24-bit audio is typically
+# carried in 32-bit containers, hence the int32 mapping.
+_DEFAULT_DTYPE = np.dtype('float32')
+_DTYPE_TABLE = {
+    (16, False): np.dtype('int16'),
+    (32, True): np.dtype('float32'),
+    (32, False): np.dtype('int32'),
+    (64, True): np.dtype('float64'),
+    (24, False): np.dtype('int32'),
+}
+_COMMON_TABLE = {
+    (16, False): AudioCommonFormat.PCM_FORMAT_INT16,
+    (32, True): AudioCommonFormat.PCM_FORMAT_FLOAT32,
+    (32, False): AudioCommonFormat.PCM_FORMAT_INT32,
+    (64, True): AudioCommonFormat.PCM_FORMAT_FLOAT64,
+    (24, False): AudioCommonFormat.PCM_FORMAT_INT32,
+}
+
+# Intern table for AudioFormat instances. The space of formats actually
+# used by a pipeline is tiny, so interning collapses repeated
+# construction to a dict hit and lets compatibility checks short-circuit
+# on identity.
+_FORMAT_CACHE: dict = {}
+
+
+@dataclass(frozen=True, slots=True)
+class AudioFormat:
+    """
+    Represents an audio format configuration.
+    
+    Attributes:
+        sample_rate: Sample rate in Hz
+        channel_count: Number of channels
+        bit_depth: Bit depth (16, 24, 32, 64)
+        is_interleaved: Whether samples are interleaved
+        is_float: Whether format uses floating point
+    """
+    sample_rate: float
+    channel_count: int
+    bit_depth: int
+    is_interleaved: bool
+    is_float: bool = False
+    # Derived values, computed once at construction. The dataclass is
+    # frozen, so these are pure functions of the fields above and caching
+    # them turns every hot-path property access into an attribute read.
+    _bytes_per_frame: int = field(init=False, repr=False, compare=False)
+    _bytes_per_packet: int = field(init=False, repr=False, compare=False)
+    _common_format: 'AudioCommonFormat' = field(init=False, repr=False, compare=False)
+    _numpy_dtype: 'np.dtype' = field(init=False, repr=False, compare=False)
+    _description: str = field(init=False, repr=False, compare=False)
+    _key: tuple = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Validate, adjust and precompute derived format parameters"""
+        if self.bit_depth == 32 and not self.is_float:
+            # Default to float for 32-bit
+            object.__setattr__(self, 'is_float', True)
+
+        _set = object.__setattr__
+        key = (self.sample_rate, self.channel_count, self.bit_depth,
+               self.is_interleaved, self.is_float)
+        _set(self, '_key', key)
+        _set(self, '_hash', hash(key))
+        bytes_per_frame = (self.bit_depth // 8) * (self.channel_count if self.is_interleaved else 1)
+        _set(self, '_bytes_per_frame', bytes_per_frame)
+        _set(self, '_bytes_per_packet',
+             bytes_per_frame * (1 if self.is_interleaved else self.channel_count))
+        sample_key = (self.bit_depth, self.is_float)
+        _set(self, '_common_format',
+             _COMMON_TABLE.get(sample_key, AudioCommonFormat.PCM_FORMAT_FLOAT32))
+        _set(self, '_numpy_dtype', _DTYPE_TABLE.get(sample_key, _DEFAULT_DTYPE))
+
+        format_type = "Float" if self.is_float else "Int"
+        layout = "Interleaved" if self.is_interleaved else "Non-interleaved"
+        _set(self, '_description',
+             f"{int(self.sample_rate)}Hz, {self.channel_count}ch, "
+             f"{self.bit_depth}-bit {format_type}, {layout}")
+
+    @property
+    def bytes_per_frame(self) -> int:
+        """Bytes per frame (precomputed)"""
+        return self._bytes_per_frame
+
+    @property
+    def bytes_per_packet(self) -> int:
+        """Bytes per packet (precomputed)"""
+        return self._bytes_per_packet
+
+    @property
+    def common_format(self) -> AudioCommonFormat:
+        """Common format type (precomputed)"""
+        return self._common_format
+
+    @property
+    def numpy_dtype(self) -> np.dtype:
+        """NumPy dtype for this format (precomputed)"""
+        return self._numpy_dtype
+    
+    @classmethod
+    def get(
+        cls,
+        sample_rate: float,
+        channel_count: int,
+        bit_depth: int,
+        is_interleaved: bool,
+        is_float: bool = False
+    ) -> 'AudioFormat':
+        """
+        Get an interned AudioFormat instance.
+
+        Returns a shared singleton for each distinct parameter tuple so
+        repeated lookups are a dict hit instead of a construction, and
+        interned formats compare by identity on the fast path.
+        """
+        key = (sample_rate, channel_count, bit_depth, is_interleaved, is_float)
+        fmt = _FORMAT_CACHE.get(key)
+        if fmt is None:
+            fmt = cls(sample_rate, channel_count, bit_depth, is_interleaved, is_float)
+            _FORMAT_CACHE[key] = fmt
+        return fmt
+
+    def with_interleaved(self, interleaved: bool) -> 'AudioFormat':
+        """
+        Get this format with a different interleaving, via the intern
+        table.
+
+        Returns self when the layout already matches; otherwise a cache
+        hit after the first conversion in each direction.
+        """
+        if interleaved == self.is_interleaved:
+            return self
+        return AudioFormat.get(self.sample_rate, self.channel_count,
+                               self.bit_depth, interleaved, self.is_float)
+
+    def is_compatible(self, other: 'AudioFormat') -> bool:
+        """Check if format is compatible with another format"""
+        return self is other or self._key == other._key
+
+    def requires_conversion(self, other: 'AudioFormat') -> bool:
+        """Check if format requires conversion to another format"""
+        return self is not other and self._key != other._key
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, AudioFormat):
+            return self._key == other._key
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
+    
+    @property
+    def description(self) -> str:
+        """Human-readable description (precomputed)"""
+        return self._description
+    
+    # Common format presets
+    @classmethod
+    def default_format(cls) -> 'AudioFormat':
+        """Default capture format (48kHz, 2ch, 32-bit float, non-interleaved)"""
+        return cls.get(48000.0, 2, 32, is_interleaved=False, is_float=True)
+    
+    @classmethod
+    def cd_quality(cls) -> 'AudioFormat':
+        """CD quality format (44.1kHz, 2ch, 16-bit int, interleaved)"""
+        return cls.get(44100.0, 2, 16, is_interleaved=True, is_float=False)
+    
+    @classmethod
+    def standard_wav(cls) -> 'AudioFormat':
+        """Standard WAV format (48kHz, 2ch, 16-bit int, interleaved)"""
+        return cls.get(48000.0, 2, 16, is_interleaved=True, is_float=False)
+    
+    @classmethod
+    def high_quality(cls) -> 'AudioFormat':
+        """High quality format (96kHz, 2ch, 24-bit int, interleaved)"""
+        return cls.get(96000.0, 2, 24, is_interleaved=True, is_float=False)
+
+
+class FormatPriority(Enum):
+    """Format negotiation priority"""
+    QUALITY = auto()        # Prefer highest quality
+    COMPATIBILITY = auto()  # Prefer most compatible format
+    PERFORMANCE = auto()    # Prefer least conversion
+    BALANCED = auto()       # Balance all factors
+
+
+@dataclass
+class FormatPreferences:
+    """Format negotiation preferences"""
+    priority: FormatPriority
+    max_sample_rate: Optional[float] = None
+    max_bit_depth: Optional[int] = None
+    prefer_interleaved: bool = True
+    prefer_float: bool = False
+    
+    @classmethod
+    def default(cls) -> 'FormatPreferences':
+        """Default preferences"""
+        return cls(
+            priority=FormatPriority.BALANCED,
+            max_sample_rate=None,
+            max_bit_depth=None,
+            prefer_interleaved=True,
+            prefer_float=False
+        )
+    
+    @classmethod
+    def high_quality(cls) -> 'FormatPreferences':
+        """High quality preferences"""
+        return cls(
+            priority=FormatPriority.QUALITY,
+            max_sample_rate=192000.0,
+            max_bit_depth=32,
+            prefer_interleaved=False,
+            prefer_float=True
+        )
+    
+    @classmethod
+    def performance(cls) -> 'FormatPreferences':
+        """Performance preferences"""
+        return cls(
+            priority=FormatPriority.PERFORMANCE,
+            max_sample_rate=48000.0,
+            max_bit_depth=16,
+            prefer_interleaved=True,
+            prefer_float=False
+        )
+
+
+# Conversion complexity per difference mask, indexed by a 5-bit packing
+# of (sample_rate, channel_count, bit_depth, is_float, is_interleaved)
+# mismatches. Precomputing all 32 combinations turns the scoring into a
+# single branchless table load.
+_COMPLEXITY_WEIGHTS = (0.3, 0.2, 0.2, 0.2, 0.1)
+_COMPLEXITY_TABLE = tuple(
+    min(sum(w for bit, w in enumerate(_COMPLEXITY_WEIGHTS) if mask >> bit & 1), 1.0)
+    for mask in range(32)
+)
+_COMPLEXITY_WEIGHTS_F32 = np.array(_COMPLEXITY_WEIGHTS, dtype=np.float32)
+
+
+class AudioFormatNegotiator:
+    """Handles format negotiation and conversion"""
+    
+    @staticmethod
+    def negotiate(
+        source: AudioFormat,
+        destination: AudioFormat,
+        preferences: FormatPreferences = None
+    ) -> AudioFormat:
+        """Find best common format between source and destination"""
+        if preferences is None:
+            preferences = FormatPreferences.default()
+        
+        # If formats match, no negotiation needed
+        if source.is_compatible(destination):
+            return source
+        
+        # Apply preferences
+        if preferences.priority == FormatPriority.QUALITY:
+            # Prefer higher sample rate and bit depth
+            return AudioFormat(
+                sample_rate=max(source.sample_rate, destination.sample_rate),
+                channel_count=max(source.channel_count, destination.channel_count),
+                bit_depth=max(source.bit_depth, destination.bit_depth),
+                is_interleaved=destination.is_interleaved,
+                is_float=source.is_float or destination.is_float
+            )
+        
+        elif preferences.priority == FormatPriority.COMPATIBILITY:
+            # Prefer destination format for maximum compatibility
+            return destination
+        
+        elif preferences.priority == FormatPriority.PERFORMANCE:
+            # Prefer source format to minimize conversion
+            return source
+        
+        else:  # BALANCED
+            # Find middle ground
+            return AudioFormat(
+                sample_rate=destination.sample_rate,  # Use destination sample rate
+                channel_count=min(source.channel_count, destination.channel_count),
+                bit_depth=destination.bit_depth,
+                is_interleaved=destination.is_interleaved,
+                is_float=destination.is_float
+            )
+    
+    @staticmethod
+    def can_convert(source: AudioFormat, destination: AudioFormat) -> bool:
+        """Check if direct conversion is possible"""
+        # Sample rate conversion is supported
+        if source.sample_rate != destination.sample_rate:
+            return True
+        
+        # Channel count mismatch - check if downmix/upmix is possible
+        if source.channel_count != destination.channel_count:
+            if source.channel_count > 2 and destination.channel_count == 2:
+                return True  # Can downmix to stereo
+            if source.channel_count == 1 and destination.channel_count == 2:
+                return True  # Can upmix mono to stereo
+        
+        # Format conversion is generally possible
+        return True
+    
+    @staticmethod
+    def conversion_complexity(source: AudioFormat, destination: AudioFormat) -> float:
+        """Get conversion complexity score (0.0 = simple, 1.0 = complex)"""
+        # Pack the five mismatch flags into one index and look up the
+        # precomputed score instead of accumulating through five branches
+        mask = (
+            (source.sample_rate != destination.sample_rate)
+            | (source.channel_count != destination.channel_count) << 1
+            | (source.bit_depth != destination.bit_depth) << 2
+            | (source.is_float != destination.is_float) << 3
+            | (source.is_interleaved != destination.is_interleaved) << 4
+        )
+        return _COMPLEXITY_TABLE[mask]
+
+    @staticmethod
+    def complexity_bulk(
+        source: AudioFormat,
+        candidates: 'list[AudioFormat]'
+    ) -> np.ndarray:
+        """
+        Score conversion complexity against many candidate formats at once.
+
+        Stacks the candidate fields into arrays and computes all scores
+        with one broadcast, so enumerating device capabilities costs one
+        vectorized kernel instead of a Python call per candidate.
+
+        Args:
+            source: Source format to convert from
+            candidates: Candidate destination formats
+
+        Returns:
+            Array of complexity scores, one per candidate
+        """
+        count = len(candidates)
+        rates = np.fromiter(
+            (c.sample_rate for c in candidates), dtype=np.float64, count=count)
+        channels = np.fromiter(
+            (c.channel_count for c in candidates), dtype=np.int64, count=count)
+        bits = np.fromiter(
+            (c.bit_depth for c in candidates), dtype=np.int64, count=count)
+        floats = np.fromiter(
+            (c.is_float for c in candidates), dtype=np.bool_, count=count)
+        interleaved = np.fromiter(
+            (c.is_interleaved for c in candidates), dtype=np.bool_, count=count)
+
+        mask = np.stack([
+            rates != source.sample_rate,
+            channels != source.channel_count,
+            bits != source.bit_depth,
+            floats != source.is_float,
+            interleaved != source.is_interleaved,
+        ], axis=1).astype(np.float32)
+        return np.minimum(mask @ _COMPLEXITY_WEIGHTS_F32, 1.0)
+
+
+class AudioBuffer:
+    """Audio buffer wrapper for format-aware operations"""
+    
+    def __init__(
+        self,
+        data: np.ndarray,
+        format: AudioFormat,
+        timestamp: Optional[datetime] = None
+    ):
+        """
+        Initialize audio buffer.
+        
+        Args:
+            data: NumPy array containing audio data
+            format: Audio format specification
+            timestamp: Timestamp of buffer capture
+        """
+        self.data = data
+        self.format = format
+        self._timestamp = timestamp
+        self._timestamp_ns = time.monotonic_ns() if timestamp is None else None
+
+        # Validate the layout in a single pass and cache the derived
+        # geometry; buffers arrive at packet rate, so frame_count and
+        # duration must stay attribute-cheap.
+        ndim = data.ndim
+        if ndim == 2:
+            # Interleaved: (frames, channels); non-interleaved: (channels, frames)
+            channel_axis = 1 if format.is_interleaved else 0
+            if data.shape[channel_axis] != format.channel_count:
+                raise ValueError(
+                    f"Data shape {data.shape} doesn't match format "
+                    f"({format.channel_count} channels)"
+                )
+            frame_count = data.shape[1 - channel_axis]
+        else:
+            # 1D array for mono or pre-interleaved samples
+            frame_count = data.shape[0] if ndim == 1 else 0
+        self._ndim = ndim
+        # Plain attributes: these are read per buffer and per UI update,
+        # so they skip the descriptor protocol entirely.
+        self.frame_count = frame_count
+        self._inv_sample_rate = 1.0 / format.sample_rate
+        self._channel_view = None
+        self._mv = None
+
+    @property
+    def mv(self) -> memoryview:
+        """
+        Cached read-only memoryview over the sample bytes.
+
+        Outputs that only serialize the buffer (file, network) can hand
+        this straight to a writer instead of calling tobytes(), which
+        would copy. Only valid while the buffer's backing array is
+        alive, and only for C-contiguous data.
+        """
+        view = self._mv
+        if view is None:
+            view = memoryview(self.data).toreadonly().cast('B')
+            self._mv = view
+        return view
+
+    @property
+    def channels(self) -> np.ndarray:
+        """
+        Channel-major (channels, frames) view of the samples.
+
+        The view is zero-copy regardless of storage layout (interleaved
+        buffers are exposed through a transpose), so per-channel kernels
+        can index channels[c] without rearranging the buffer first.
+        """
+        view = self._channel_view
+        if view is None:
+            if self._ndim == 1:
+                view = self.data.reshape(1, -1)
+            elif self.format.is_interleaved:
+                view = self.data.T
+            else:
+                view = self.data
+            self._channel_view = view
+        return view
+
+    @property
+    def timestamp(self) -> datetime:
+        """Capture timestamp, converted from the monotonic clock on
+        first read"""
+        ts = self._timestamp
+        if ts is None:
+            ts = datetime.fromtimestamp(
+                (_MONOTONIC_EPOCH_NS + self._timestamp_ns) / 1e9)
+            self._timestamp = ts
+        return ts
+
+    @property
+    def duration(self) -> float:
+        """Get duration in seconds"""
+        return self.frame_count * self._inv_sample_rate
+    
+    def to_interleaved(self, ensure_contiguous: bool = False) -> 'AudioBuffer':
+        """
+        Convert to interleaved format.
+
+        Args:
+            ensure_contiguous: Materialize a C-contiguous copy up front.
+                The default transposed view is zero-copy, but downstream
+                tobytes()/C-API consumers would force a strided copy per
+                access; paying for one linear rearrangement here is
+                cheaper when the buffer is serialized.
+        """
+        if self.format.is_interleaved:
+            return self
+
+        # Transpose data from (channels, frames) to (frames, channels)
+        interleaved_data = self.data.T
+        if ensure_contiguous:
+            interleaved_data = np.ascontiguousarray(interleaved_data)
+
+        return AudioBuffer(interleaved_data,
+                           self.format.with_interleaved(True),
+                           self.timestamp)
+    
+    def to_interleaved_into(self, out: np.ndarray) -> np.ndarray:
+        """
+        Write interleaved samples into a preallocated (frames, channels)
+        array, avoiding any allocation in the steady-state audio loop.
+
+        Args:
+            out: Destination array shaped (frames, channels)
+
+        Returns:
+            The destination array
+        """
+        np.copyto(out, self.data if self.format.is_interleaved else self.data.T)
+        return out
+
+    def to_non_interleaved(self, ensure_contiguous: bool = False) -> 'AudioBuffer':
+        """
+        Convert to non-interleaved format.
+
+        Args:
+            ensure_contiguous: Materialize a C-contiguous copy up front
+                (see to_interleaved)
+        """
+        if not self.format.is_interleaved:
+            return self
+
+        # Transpose data from (frames, channels) to (channels, frames)
+        non_interleaved_data = self.data.T
+        if ensure_contiguous:
+            non_interleaved_data = np.ascontiguousarray(non_interleaved_data)
+
+        return AudioBuffer(non_interleaved_data,
+                           self.format.with_interleaved(False),
+                           self.timestamp)
\ No newline at end of file
@@ -7,20 +7,23 @@ playback, and ring buffers.
 """
 
 import asyncio
+import logging
 import os
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from threading import Lock
 from typing import Optional, Callable, Union
 import uuid
 import numpy as np
-import queue
 
 from .AudioFormat import AudioFormat, AudioBuffer
-from .AudioBufferQueue import AudioBufferQueue, CircularAudioBufferQueue
+from .AudioBufferQueue import AudioBufferQueue, AudioBufferPool, SampleRingBuffer
 from .AudioError import OutputNotConfiguredError, BufferAllocationFailedError
 
+logger = logging.getLogger(__name__)
+
 
 class AudioOutput(ABC):
     """Base class for audio output destinations"""
@@ -54,6 +57,23 @@ class AudioOutput(ABC):
         """
         pass
     
+    def process_sync(self, buffer: AudioBuffer) -> bool:
+        """
+        Try to process a buffer without awaiting.
+        
+        Outputs whose steady-state path never blocks (ring, stream
+        queue) accept the buffer here so the producer loop skips the
+        coroutine allocation of process() per buffer. The default
+        declines, in which case the caller must await process().
+        
+        Args:
+            buffer: Audio buffer to process
+            
+        Returns:
+            True if the buffer was fully handled synchronously
+        """
+        return False
+    
     @abstractmethod
     async def handle_error(self, error: Exception) -> None:
         """
@@ -84,7 +104,10 @@ class FileOutput(AudioOutput):
         self.file_path = Path(file_path)
         self._writer = None
         self._is_configured = False
-        self._write_lock = Lock()
+        self._dtype = None
+        self._bytes_fast_path = False
+        self._blocksize = 65536
+        self._accum = None
     
     async def configure(self, format: AudioFormat) -> None:
         """Configure the output with audio format"""
@@ -104,24 +127,90 @@ class FileOutput(AudioOutput):
         
         # Start writing
         await self._writer.start_writing()
+
+        # Buffers that already match the file's sample format can skip
+        # the writer's conversion pass and go down as raw bytes.
+        # 24-bit needs repacking and non-interleaved data needs a
+        # transpose, so those stay on the converting path.
+        self._dtype = format.numpy_dtype
+        self._bytes_fast_path = (
+            format.bit_depth != 24
+            and (format.is_interleaved or format.channel_count == 1)
+        )
+        # Coalesce raw writes up to the filesystem's preferred block
+        # size so the writer sees a few large writes per second instead
+        # of one per 10-20 ms capture buffer (st_blksize is not
+        # reported on all platforms; fall back to 64 KiB)
+        try:
+            st = os.stat(self.file_path.parent)
+            self._blocksize = max(getattr(st, 'st_blksize', 0), 65536)
+        except OSError:
+            self._blocksize = 65536
+        self._accum = bytearray()
+        # Specialize the per-buffer path for this format: the closure
+        # carries the writer methods and expected dtype as locals, so
+        # steady-state buffers skip the configured-state check and the
+        # repeated attribute lookups. finish() restores the class method.
+        self.process = self._make_process(format)
         self._is_configured = True
     
+    def _make_process(self, format: AudioFormat):
+        """Build a process coroutine specialized for the configured format"""
+        dtype = format.numpy_dtype
+        fast_path = self._bytes_fast_path
+        blocksize = self._blocksize
+        write_bytes = self._writer.write_bytes
+        write = self._writer.write
+        
+        async def process(buffer: AudioBuffer) -> None:
+            # Single-writer design: process() is awaited serially by the
+            # session pipeline and the writer serializes its own file
+            # access, so no additional lock is taken on the hot path
+            data = buffer.data
+            if fast_path and data.dtype == dtype:
+                accum = self._accum
+                if data.flags['C_CONTIGUOUS']:
+                    # Zero-copy view of the sample bytes; block-or-
+                    # larger buffers skip coalescing when nothing is
+                    # pending
+                    raw = buffer.mv
+                    if not accum and raw.nbytes >= blocksize:
+                        await write_bytes(raw)
+                        return
+                    accum += raw
+                else:
+                    accum += np.ascontiguousarray(data).tobytes()
+                if len(accum) >= blocksize:
+                    self._accum = bytearray()
+                    await write_bytes(accum)
+            else:
+                await self._flush_accum()
+                await write(data)
+        
+        return process
+    
+    async def _flush_accum(self) -> None:
+        """Write any coalesced raw bytes before mixed or final writes"""
+        accum = self._accum
+        if accum:
+            self._accum = bytearray()
+            await self._writer.write_bytes(accum)
+    
     async def process(self, buffer: AudioBuffer) -> None:
         """Process audio buffer by writing to file"""
-        if not self._is_configured or not self._writer:
-            raise OutputNotConfiguredError()
-        
-        # Write buffer to file in thread-safe manner
-        with self._write_lock:
-            await self._writer.write(buffer.data)
+        # Only reachable before configure() installs the specialized
+        # closure or after finish() removes it
+        raise OutputNotConfiguredError()
     
     async def handle_error(self, error: Exception) -> None:
         """Handle errors during file writing"""
-        print(f"FileOutput error: {error}")
+        logger.error("FileOutput error: %s", error)
     
     async def finish(self) -> None:
         """Finish writing and close the file"""
+        self.__dict__.pop('process', None)
         if self._writer:
+            await self._flush_accum()
             await self._writer.stop_writing()
             self._writer = None
         self._is_configured = False
@@ -141,6 +230,10 @@ class StreamOutput(AudioOutput):
         self._buffer_queue = AudioBufferQueue(max_size=queue_size)
         self._format = None
         self._is_configured = False
+        # Arrivals are coalesced and enqueued in bursts so the queue
+        # lock and asyncio machinery run once per batch, not per buffer
+        self._pending: list = []
+        self._flush_scheduled = False
     
     @property
     def buffer_stream(self):
@@ -154,17 +247,42 @@ class StreamOutput(AudioOutput):
     
     async def process(self, buffer: AudioBuffer) -> None:
         """Process audio buffer by adding to queue"""
-        if not self._is_configured:
+        if not self.process_sync(buffer):
             raise OutputNotConfiguredError()
-        
-        await self._buffer_queue.enqueue(buffer)
     
+    def process_sync(self, buffer: AudioBuffer) -> bool:
+        """Coalesce the buffer for the next batch flush; never blocks"""
+        if not self._is_configured:
+            return False
+
+        # Stream consumers read the buffer after the capture fan-out
+        # returns, so a pool-owned array must be detached before its
+        # slot is recycled
+        if getattr(buffer, 'pool_owned', False):
+            buffer = AudioBuffer(buffer.data.copy(), buffer.format,
+                                 buffer.timestamp)
+        self._pending.append(buffer)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return True
+
+    def _flush(self) -> None:
+        """Enqueue all coalesced buffers in one batch"""
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        self._buffer_queue.enqueue_many(pending)
+
     async def handle_error(self, error: Exception) -> None:
         """Handle errors during streaming"""
         self._buffer_queue.handle_error(error)
     
     async def finish(self) -> None:
         """Finish streaming"""
+        self._flush()
         await self._buffer_queue.finish()
         self._is_configured = False
     
@@ -189,42 +307,41 @@ class CallbackOutput(AudioOutput):
         Initialize callback output.
         
         Args:
-            handler: Callback function that receives numpy arrays
+            handler: Callback function that receives numpy arrays; in
+                the synchronous (use_thread=False) mode the array is the
+                live buffer, so copy it before retaining it
             use_thread: Whether to call handler in separate thread
         """
         super().__init__()
         self._handler = handler
         self._use_thread = use_thread
         self._is_configured = False
-        
-        if use_thread:
-            self._callback_queue = queue.Queue()
-            self._callback_task = None
+        self._pool = AudioBufferPool()
+        self._loop = None
+        self._executor = None
     
     async def configure(self, format: AudioFormat) -> None:
         """Configure the output"""
-        self._is_configured = True
-        
         if self._use_thread:
-            # Start callback thread
-            import threading
-            self._callback_task = threading.Thread(
-                target=self._callback_worker,
-                daemon=True
+            # Single-worker executor: callbacks keep their ordering and
+            # the worker thread only exists while work is queued-or-
+            # running instead of parking a dedicated thread for the
+            # lifetime of the output
+            self._loop = asyncio.get_running_loop()
+            self._executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix='CallbackOutput'
             )
-            self._callback_task.start()
-    
-    def _callback_worker(self):
-        """Worker thread for callbacks"""
-        while self._is_configured:
-            try:
-                buffer_data = self._callback_queue.get(timeout=0.1)
-                if buffer_data is not None:
-                    self._handler(buffer_data)
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Callback error: {e}")
+        self._is_configured = True
+    
+    def _run_handler(self, buffer_data: np.ndarray) -> None:
+        """Invoke the handler on the executor thread"""
+        try:
+            self._handler(buffer_data)
+        except Exception as e:
+            logger.error("Callback error: %s", e)
+        finally:
+            self._pool.release(buffer_data)
     
     async def process(self, buffer: AudioBuffer) -> None:
         """Process audio buffer by calling handler"""
@@ -232,23 +349,31 @@ class CallbackOutput(AudioOutput):
             raise OutputNotConfiguredError()
         
         if self._use_thread:
-            # Queue for thread
-            self._callback_queue.put(buffer.data.copy())
+            # Copy into a pooled scratch array for the thread handoff;
+            # _run_handler returns it to the pool after the handler runs
+            data = buffer.data
+            scratch = self._pool.acquire(data.shape, data.dtype)
+            np.copyto(scratch, data)
+            self._loop.run_in_executor(self._executor, self._run_handler, scratch)
         else:
-            # Direct call
-            self._handler(buffer.data.copy())
+            # Direct call on the shared backing array — no copy. The
+            # handler runs before process() returns, so it may read the
+            # data freely but must copy if it needs to retain it.
+            self._handler(buffer.data)
     
     async def handle_error(self, error: Exception) -> None:
         """Handle errors during callback"""
-        print(f"CallbackOutput error: {error}")
+        logger.error("CallbackOutput error: %s", error)
     
     async def finish(self) -> None:
         """Finish callback output"""
         self._is_configured = False
         
-        if self._use_thread and self._callback_queue:
-            # Signal thread to stop
-            self._callback_queue.put(None)
+        if self._executor is not None:
+            # Queued callbacks still run to completion; wait=False just
+            # avoids blocking the event loop on them
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
 
 class PlaybackOutput(AudioOutput):
@@ -289,6 +414,9 @@ class PlaybackOutput(AudioOutput):
         )
         
         await self._player.start_playback()
+        # Gain lives in the player, which already scales during
+        # scheduling; applying it here as well would square the volume
+        self._player.set_volume(self._volume)
         self._is_configured = True
     
     async def process(self, buffer: AudioBuffer) -> None:
@@ -296,13 +424,14 @@ class PlaybackOutput(AudioOutput):
         if not self._is_configured or not self._player:
             raise OutputNotConfiguredError()
         
-        # Apply volume
-        audio_data = buffer.data * self._volume
-        await self._player.schedule_buffer(audio_data)
+        # Pass the buffer through unchanged: dtype conversion and the
+        # volume scale both happen once, inside the player's scheduling
+        # pass
+        await self._player.schedule_buffer(buffer.data)
     
     async def handle_error(self, error: Exception) -> None:
         """Handle errors during playback"""
-        print(f"PlaybackOutput error: {error}")
+        logger.error("PlaybackOutput error: %s", error)
     
     async def finish(self) -> None:
         """Stop playback"""
@@ -319,6 +448,8 @@ class PlaybackOutput(AudioOutput):
             volume: Volume level (0.0 to 1.0)
         """
         self._volume = max(0.0, min(1.0, volume))
+        if self._player:
+            self._player.set_volume(self._volume)
     
     def get_volume(self) -> float:
         """Get current volume"""
@@ -342,6 +473,8 @@ class RingBufferOutput(AudioOutput):
         self._is_configured = False
         self._total_samples = 0
         self._sample_size = 0
+        self._last_enqueue_ns = 0
+        self._ns_per_sample = 0.0
     
     async def configure(self, format: AudioFormat) -> None:
         """Configure the output with audio format"""
@@ -351,41 +484,51 @@ class RingBufferOutput(AudioOutput):
         samples_per_second = int(format.sample_rate * format.channel_count)
         buffer_samples = int(samples_per_second * self._buffer_duration)
         
-        # Create circular buffer
-        self._ring_buffer = CircularAudioBufferQueue(capacity=buffer_samples)
+        # Create sample ring sized for the requested duration
+        self._ring_buffer = SampleRingBuffer(
+            capacity=buffer_samples,
+            dtype=format.numpy_dtype
+        )
         self._sample_size = format.bit_depth // 8
+        # Base-plus-offset timestamping: one monotonic stamp is taken
+        # per enqueued block and per-sample times are derived from the
+        # sample rate on demand
+        self._ns_per_sample = 1_000_000_000.0 / samples_per_second
+        # The ring stores samples in their native PCM dtype (int16 for
+        # 16-bit captures), so float conversion is deferred to
+        # read_float and the ring carries half the bandwidth of a
+        # float32 store
+        if format.is_float:
+            self._float_scale = None
+        else:
+            self._float_scale = 1.0 / float(2 ** (format.bit_depth - 1))
+        self._read_scratch = None
         
         self._is_configured = True
     
     async def process(self, buffer: AudioBuffer) -> None:
         """Process audio buffer by adding to ring buffer"""
-        if not self._is_configured or not self._ring_buffer:
+        if not self.process_sync(buffer):
             raise OutputNotConfiguredError()
-        
-        # Flatten buffer data if needed
-        if buffer.data.ndim > 1:
-            data = buffer.data.flatten()
-        else:
-            data = buffer.data
-        
-        # Add samples to ring buffer
-        for sample in data:
-            audio_buffer = AudioBuffer(
-                data=np.array([sample]),
-                format=self._format,
-                timestamp=datetime.now()
-            )
-            
-            if not self._ring_buffer.try_enqueue(audio_buffer):
-                # Buffer overflow - drop oldest by dequeuing
-                self._ring_buffer.try_dequeue()
-                self._ring_buffer.try_enqueue(audio_buffer)
-        
-        self._total_samples += len(data)
+    
+    def process_sync(self, buffer: AudioBuffer) -> bool:
+        """Bulk-enqueue into the ring; never blocks (writer wins)"""
+        if not self._is_configured or not self._ring_buffer:
+            return False
+        
+        # Bulk-enqueue the whole block; the ring flattens multi-channel
+        # arrays as a view and drops oldest samples in O(1) on overflow.
+        # One timestamp covers the block instead of stamping every
+        # sample.
+        written = self._ring_buffer.enqueue_block(buffer.data)
+        self._last_enqueue_ns = time.monotonic_ns()
+
+        self._total_samples += written
+        return True
     
     async def handle_error(self, error: Exception) -> None:
         """Handle errors"""
-        print(f"RingBufferOutput error: {error}")
+        logger.error("RingBufferOutput error: %s", error)
     
     async def finish(self) -> None:
         """Finish and cleanup"""
@@ -405,18 +548,56 @@ class RingBufferOutput(AudioOutput):
         """
         if not self._ring_buffer:
             return None
-        
-        samples = []
-        for _ in range(num_samples):
-            buffer = self._ring_buffer.try_dequeue()
-            if buffer is None:
-                break
-            samples.extend(buffer.data.tolist())
-        
-        if not samples:
+
+        out = np.empty(num_samples, dtype=self._format.numpy_dtype)
+        got = self._ring_buffer.dequeue_into(out, num_samples)
+        if got == 0:
             return None
+        return out if got == num_samples else out[:got]
+    
+    def read_float(self, num_samples: int) -> Optional[np.ndarray]:
+        """
+        Read samples as float32 in [-1, 1], converting from the ring's
+        native PCM storage only at the moment of the read.
         
-        return np.array(samples, dtype=self._format.numpy_dtype)
+        Args:
+            num_samples: Number of samples to read
+            
+        Returns:
+            float32 array of samples or None if the ring is empty
+        """
+        if not self._ring_buffer:
+            return None
+
+        out = np.empty(num_samples, dtype=np.float32)
+        if self._float_scale is None:
+            # Ring already stores floats; dequeue straight into out
+            got = self._ring_buffer.dequeue_into(out, num_samples)
+        else:
+            scratch = self._read_scratch
+            if scratch is None or len(scratch) < num_samples:
+                scratch = np.empty(num_samples, dtype=self._format.numpy_dtype)
+                self._read_scratch = scratch
+            got = self._ring_buffer.dequeue_into(scratch, num_samples)
+            np.multiply(scratch[:got], self._float_scale,
+                        out=out[:got], casting='unsafe')
+        if got == 0:
+            return None
+        return out if got == num_samples else out[:got]
+    
+    def sample_timestamp_ns(self, samples_ago: int = 0) -> int:
+        """
+        Monotonic timestamp (ns) for a sample still in the ring.
+
+        Args:
+            samples_ago: How far behind the most recently written
+                sample, 0 being the newest
+
+        Returns:
+            time.monotonic_ns()-domain timestamp derived from the last
+            enqueue stamp and the sample rate
+        """
+        return self._last_enqueue_ns - int(samples_ago * self._ns_per_sample)
     
     def available_samples(self) -> int:
         """Get number of available samples in buffer"""
@@ -424,6 +605,12 @@ class RingBufferOutput(AudioOutput):
             return 0
         return self._ring_buffer.count
     
+    def dropped_samples(self) -> int:
+        """Get number of samples dropped to overflow since configure"""
+        if not self._ring_buffer:
+            return 0
+        return self._ring_buffer.samples_dropped
+    
     def clear(self) -> None:
         """Clear the ring buffer"""
         if self._ring_buffer:
@@ -473,7 +660,7 @@ class NetworkOutput(AudioOutput):
     
     async def handle_error(self, error: Exception) -> None:
         """Handle network errors"""
-        print(f"NetworkOutput error: {error}")
+        logger.error("NetworkOutput error: %s", error)
     
     async def finish(self) -> None:
         """Stop network server"""
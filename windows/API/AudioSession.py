@@ -1,518 +1,749 @@
-"""
-AudioSession - Session management for audio capture and playback
-
-This module provides session management for audio operations, including
-state tracking, output management, and configuration handling.
-"""
-
-import asyncio
-import uuid
-from dataclasses import dataclass, field
-from datetime import datetime
-from enum import Enum, auto
-from typing import List, Dict, Optional, Callable, Any
-import numpy as np
-
-from .AudioFormat import AudioFormat, AudioBuffer
-from .AudioOutput import AudioOutput
-from .AudioDevice import AudioDevice
-from .StreamingAudioRecorder import StreamingAudioRecorder, AudioStreamDelegate
-from .StreamingAudioPlayer import StreamingAudioPlayer
-from .AudioError import InvalidStateError, SessionNotFoundError
-from .AudioBufferQueue import ConvertingBufferCollector
-
-
-class SessionState(Enum):
-    """Session state enumeration"""
-    IDLE = "idle"
-    STARTING = "starting"
-    ACTIVE = "active"
-    PAUSED = "paused"
-    STOPPING = "stopping"
-    STOPPED = "stopped"
-    ERROR = "error"
-
-
-@dataclass
-class SessionStatistics:
-    """Session statistics"""
-    session_id: uuid.UUID
-    state: SessionState
-    buffer_count: int
-    duration: float
-    format: Optional[AudioFormat]
-    created_at: datetime = field(default_factory=datetime.now)
-    
-    @property
-    def uptime(self) -> float:
-        """Get session uptime in seconds"""
-        return (datetime.now() - self.created_at).total_seconds()
-
-
-@dataclass
-class CaptureConfiguration:
-    """Audio capture configuration"""
-    device: Optional[AudioDevice] = None
-    format: Optional[AudioFormat] = None
-    buffer_size: int = 1024
-    use_converting_collector: bool = False
-    target_format: Optional[AudioFormat] = None
-    
-    def __post_init__(self):
-        if self.format is None:
-            self.format = AudioFormat.default_format()
-        if self.use_converting_collector and self.target_format is None:
-            # Default target format: 48kHz stereo
-            self.target_format = AudioFormat(
-                sample_rate=48000.0,
-                channels=2,
-                bit_depth=32,
-                is_float=True,
-                is_interleaved=True
-            )
-
-
-@dataclass
-class PlaybackConfiguration:
-    """Audio playback configuration"""
-    device: Optional[AudioDevice] = None
-    format: Optional[AudioFormat] = None
-    volume: float = 1.0
-    delay: float = 0.0
-    buffer_size: int = 1024
-    
-    def __post_init__(self):
-        if self.format is None:
-            self.format = AudioFormat.default_format()
-        self.volume = max(0.0, min(1.0, self.volume))
-        self.delay = max(0.0, self.delay)
-
-
-class AudioStreamMultiplexer(AudioStreamDelegate):
-    """Distributes audio to multiple outputs"""
-    
-    def __init__(self, converting_collector: Optional[ConvertingBufferCollector] = None):
-        """
-        Initialize audio stream multiplexer.
-        
-        Args:
-            converting_collector: Optional ConvertingBufferCollector for sample rate conversion
-        """
-        self._outputs: List[AudioOutput] = []
-        self._is_paused = False
-        self._buffer_count = 0
-        self._lock = asyncio.Lock()
-        self._converting_collector = converting_collector
-    
-    async def add_output(self, output: AudioOutput) -> None:
-        """Add an output"""
-        async with self._lock:
-            if output not in self._outputs:
-                self._outputs.append(output)
-    
-    async def remove_output(self, output: AudioOutput) -> None:
-        """Remove an output"""
-        async with self._lock:
-            if output in self._outputs:
-                self._outputs.remove(output)
-    
-    async def remove_all_outputs(self) -> None:
-        """Remove all outputs"""
-        async with self._lock:
-            self._outputs.clear()
-    
-    async def set_paused(self, paused: bool) -> None:
-        """Set paused state"""
-        self._is_paused = paused
-    
-    async def audio_streamer_did_receive(self, streamer: StreamingAudioRecorder, buffer: AudioBuffer):
-        """Handle received audio buffer"""
-        if self._is_paused:
-            return
-        
-        self._buffer_count += 1
-        
-        # Add to ConvertingBufferCollector if configured
-        if self._converting_collector:
-            self._converting_collector.add_buffer(buffer)
-        
-        # Distribute to all outputs
-        async with self._lock:
-            outputs = list(self._outputs)
-        
-        # Process outputs concurrently
-        tasks = []
-        for output in outputs:
-            tasks.append(self._process_output(output, buffer))
-        
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
-    
-    async def _process_output(self, output: AudioOutput, buffer: AudioBuffer):
-        """Process buffer for a single output"""
-        try:
-            await output.process(buffer)
-        except Exception as e:
-            print(f"Output {output.id} failed to process buffer: {e}")
-    
-    async def audio_streamer_did_encounter_error(self, streamer: StreamingAudioRecorder, error: Exception):
-        """Handle error from streamer"""
-        async with self._lock:
-            outputs = list(self._outputs)
-        
-        for output in outputs:
-            try:
-                await output.handle_error(error)
-            except Exception:
-                pass
-    
-    async def audio_streamer_did_finish(self, streamer: StreamingAudioRecorder):
-        """Handle streamer finish"""
-        async with self._lock:
-            outputs = list(self._outputs)
-        
-        for output in outputs:
-            try:
-                await output.finish()
-            except Exception:
-                pass
-
-
-class BaseAudioSession:
-    """Base class for audio sessions"""
-    
-    def __init__(self):
-        """Initialize base audio session"""
-        self.id = uuid.uuid4()
-        self.created_at = datetime.now()
-        self._state = SessionState.IDLE
-        self._statistics = SessionStatistics(
-            session_id=self.id,
-            state=SessionState.IDLE,
-            buffer_count=0,
-            duration=0.0,
-            format=None
-        )
-        self._state_observers: Dict[uuid.UUID, Callable[[SessionState], None]] = {}
-        self._error_handler: Optional[Callable[[Exception], None]] = None
-        self._state_lock = asyncio.Lock()
-    
-    async def update_state(self, new_state: SessionState) -> None:
-        """Update session state"""
-        async with self._state_lock:
-            old_state = self._state
-            self._state = new_state
-            self._statistics.state = new_state
-            
-            # Notify observers
-            observers = list(self._state_observers.values())
-        
-        # Notify outside of lock
-        for observer in observers:
-            try:
-                observer(new_state)
-            except Exception as e:
-                print(f"State observer error: {e}")
-    
-    def add_state_observer(self, observer: Callable[[SessionState], None]) -> uuid.UUID:
-        """
-        Add state observer.
-        
-        Args:
-            observer: Callback function for state changes
-            
-        Returns:
-            Observer ID for removal
-        """
-        observer_id = uuid.uuid4()
-        self._state_observers[observer_id] = observer
-        return observer_id
-    
-    def remove_state_observer(self, observer_id: uuid.UUID) -> None:
-        """Remove state observer"""
-        self._state_observers.pop(observer_id, None)
-    
-    def set_error_handler(self, handler: Callable[[Exception], None]) -> None:
-        """Set error handler"""
-        self._error_handler = handler
-    
-    async def handle_error(self, error: Exception) -> None:
-        """Handle error"""
-        await self.update_state(SessionState.ERROR)
-        if self._error_handler:
-            try:
-                self._error_handler(error)
-            except Exception:
-                pass
-    
-    def get_statistics(self) -> SessionStatistics:
-        """Get session statistics"""
-        return self._statistics
-    
-    @property
-    def state(self) -> SessionState:
-        """Get current state"""
-        return self._state
-
-
-class AudioCaptureSession(BaseAudioSession):
-    """Manages an audio capture session"""
-    
-    def __init__(self, configuration: CaptureConfiguration):
-        """
-        Initialize audio capture session.
-        
-        Args:
-            configuration: Capture configuration
-        """
-        super().__init__()
-        self._configuration = configuration
-        self._recorder: Optional[StreamingAudioRecorder] = None
-        self._outputs: List[AudioOutput] = []
-        self._session_format = configuration.format
-        self._converting_collector: Optional[ConvertingBufferCollector] = None
-        
-        # Initialize ConvertingBufferCollector if requested
-        if configuration.use_converting_collector:
-            self._converting_collector = ConvertingBufferCollector(
-                input_format=configuration.format,
-                target_format=configuration.target_format
-            )
-        
-        # Create multiplexer with optional collector
-        self._multiplexer = AudioStreamMultiplexer(self._converting_collector)
-    
-    async def start(self) -> None:
-        """Start capture session"""
-        if self._state not in (SessionState.IDLE, SessionState.STOPPED):
-            raise InvalidStateError("Session is already active")
-        
-        await self.update_state(SessionState.STARTING)
-        
-        try:
-            # Create recorder
-            self._recorder = StreamingAudioRecorder(
-                sample_rate=int(self._session_format.sample_rate),
-                channels=self._session_format.channel_count,
-                blocksize=self._configuration.buffer_size,
-                device=self._configuration.device
-            )
-            
-            # Set up multiplexer as delegate
-            self._recorder.add_delegate(self._multiplexer)
-            
-            # Start recording
-            await self._recorder.start_streaming()
-            
-            # Update statistics
-            self._statistics.format = self._session_format
-            
-            await self.update_state(SessionState.ACTIVE)
-            
-        except Exception as e:
-            await self.handle_error(e)
-            raise
-    
-    async def stop(self) -> None:
-        """Stop capture session"""
-        if self._state not in (SessionState.ACTIVE, SessionState.PAUSED):
-            raise InvalidStateError("Session is not active")
-        
-        await self.update_state(SessionState.STOPPING)
-        
-        # Stop recorder
-        if self._recorder:
-            await self._recorder.stop_streaming()
-        
-        # Notify outputs
-        for output in self._outputs:
-            try:
-                await output.finish()
-            except Exception:
-                pass
-        
-        # Clear outputs
-        self._outputs.clear()
-        await self._multiplexer.remove_all_outputs()
-        
-        await self.update_state(SessionState.STOPPED)
-    
-    async def pause(self) -> None:
-        """Pause capture session"""
-        if self._state != SessionState.ACTIVE:
-            raise InvalidStateError("Session is not active")
-        
-        await self.update_state(SessionState.PAUSED)
-        await self._multiplexer.set_paused(True)
-    
-    async def resume(self) -> None:
-        """Resume capture session"""
-        if self._state != SessionState.PAUSED:
-            raise InvalidStateError("Session is not paused")
-        
-        await self._multiplexer.set_paused(False)
-        await self.update_state(SessionState.ACTIVE)
-    
-    async def add_output(self, output: AudioOutput) -> None:
-        """
-        Add an output to the session.
-        
-        Args:
-            output: Audio output to add
-        """
-        if self._state not in (SessionState.ACTIVE, SessionState.PAUSED):
-            raise InvalidStateError("Session must be active to add outputs")
-        
-        # Configure output with session format
-        if self._session_format:
-            await output.configure(self._session_format)
-        
-        # Add to multiplexer
-        await self._multiplexer.add_output(output)
-        
-        # Track output
-        self._outputs.append(output)
-    
-    async def remove_output(self, output: AudioOutput) -> None:
-        """Remove an output from the session"""
-        await self._multiplexer.remove_output(output)
-        if output in self._outputs:
-            self._outputs.remove(output)
-        await output.finish()
-    
-    def get_outputs(self) -> List[AudioOutput]:
-        """Get all active outputs"""
-        return list(self._outputs)
-    
-    def get_configuration(self) -> CaptureConfiguration:
-        """Get session configuration"""
-        return self._configuration
-    
-    def get_format(self) -> Optional[AudioFormat]:
-        """Get session format"""
-        return self._session_format
-    
-    def get_converting_collector(self) -> Optional[ConvertingBufferCollector]:
-        """Get the converting buffer collector if configured"""
-        return self._converting_collector
-    
-    async def get_collected_audio(self) -> Optional[np.ndarray]:
-        """
-        Get all collected audio from the ConvertingBufferCollector.
-        
-        Returns:
-            Converted audio data or None if collector not configured
-        """
-        if self._converting_collector:
-            return self._converting_collector.get_all_audio()
-        return None
-
-
-class AudioPlaybackSession(BaseAudioSession):
-    """Manages an audio playback session"""
-    
-    def __init__(self, configuration: PlaybackConfiguration):
-        """
-        Initialize audio playback session.
-        
-        Args:
-            configuration: Playback configuration
-        """
-        super().__init__()
-        self._configuration = configuration
-        self._player: Optional[StreamingAudioPlayer] = None
-        self._input_source = None
-        self._session_format = configuration.format
-    
-    async def start(self) -> None:
-        """Start playback session"""
-        if self._state not in (SessionState.IDLE, SessionState.STOPPED):
-            raise InvalidStateError("Session is already active")
-        
-        await self.update_state(SessionState.STARTING)
-        
-        try:
-            # Create player
-            device_index = self._configuration.device.device_index if self._configuration.device else None
-            self._player = StreamingAudioPlayer(
-                sample_rate=int(self._session_format.sample_rate),
-                channels=self._session_format.channel_count,
-                device_index=device_index,
-                delay=self._configuration.delay,
-                blocksize=self._configuration.buffer_size
-            )
-            
-            # Set volume
-            self._player.set_volume(self._configuration.volume)
-            
-            # Start playback
-            await self._player.start_playback()
-            
-            # Update statistics
-            self._statistics.format = self._session_format
-            
-            await self.update_state(SessionState.ACTIVE)
-            
-        except Exception as e:
-            await self.handle_error(e)
-            raise
-    
-    async def stop(self) -> None:
-        """Stop playback session"""
-        if self._state not in (SessionState.ACTIVE, SessionState.PAUSED):
-            raise InvalidStateError("Session is not active")
-        
-        await self.update_state(SessionState.STOPPING)
-        
-        # Stop player
-        if self._player:
-            await self._player.stop_playback()
-        
-        # Disconnect input
-        if self._input_source:
-            await self._input_source.disconnect()
-        
-        await self.update_state(SessionState.STOPPED)
-    
-    async def pause(self) -> None:
-        """Pause playback session"""
-        if self._state != SessionState.ACTIVE:
-            raise InvalidStateError("Session is not active")
-        
-        # TODO: Implement pause in StreamingAudioPlayer
-        await self.update_state(SessionState.PAUSED)
-    
-    async def resume(self) -> None:
-        """Resume playback session"""
-        if self._state != SessionState.PAUSED:
-            raise InvalidStateError("Session is not paused")
-        
-        # TODO: Implement resume in StreamingAudioPlayer
-        await self.update_state(SessionState.ACTIVE)
-    
-    async def schedule_buffer(self, buffer: AudioBuffer) -> None:
-        """Schedule a buffer for playback"""
-        if not self._player:
-            raise InvalidStateError("Player not initialized")
-        
-        await self._player.schedule_buffer(buffer.data)
-        self._statistics.buffer_count += 1
-    
-    def set_volume(self, volume: float) -> None:
-        """Set playback volume (0.0 to 1.0)"""
-        if self._player:
-            self._player.set_volume(volume)
-    
-    def get_volume(self) -> float:
-        """Get current volume"""
-        if self._player:
-            return self._player.get_volume()
-        return self._configuration.volume
-    
-    def get_configuration(self) -> PlaybackConfiguration:
-        """Get session configuration"""
-        return self._configuration
-    
-    def get_format(self) -> Optional[AudioFormat]:
-        """Get session format"""
+"""
+AudioSession - Session management for audio capture and playback
+
+This module provides session management for audio operations, including
+state tracking, output management, and configuration handling.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from enum import Enum, auto
+from typing import List, Dict, Optional, Callable, Any
+import numpy as np
+
+from .AudioFormat import AudioFormat, AudioBuffer
+from .AudioOutput import AudioOutput
+from .AudioDevice import AudioDevice
+from .StreamingAudioRecorder import StreamingAudioRecorder, AudioStreamDelegate
+from .StreamingAudioPlayer import StreamingAudioPlayer
+from .AudioError import InvalidStateError, SessionNotFoundError
+from .AudioBufferQueue import ConvertingBufferCollector, AudioBufferPool
+
+
+logger = logging.getLogger(__name__)
+
+# Under an error storm (e.g. a broken output failing every frame) only
+# the first few failures and then a 1-in-N sample are logged, so the
+# audio path never serializes one log record per bad frame
+_ERROR_LOG_THRESHOLD = 10
+_ERROR_LOG_INTERVAL = 100
+
+# Buffers queued per output before drop-oldest kicks in; bounds memory
+# under a slow consumer to depth x buffer size
+_OUTPUT_QUEUE_DEPTH = 8
+
+# Consecutive process() failures before an output is retired from the
+# fan-out; one success resets the count, so transient errors survive
+_OUTPUT_FAILURE_LIMIT = 25
+
+
+class SessionState(Enum):
+    """Session state enumeration"""
+    IDLE = "idle"
+    STARTING = "starting"
+    ACTIVE = "active"
+    PAUSED = "paused"
+    STOPPING = "stopping"
+    STOPPED = "stopped"
+    ERROR = "error"
+
+
+@dataclass(slots=True)
+class SessionStatistics:
+    """Session statistics"""
+    session_id: uuid.UUID
+    state: SessionState
+    buffer_count: int
+    duration: float
+    format: Optional[AudioFormat]
+    created_at: datetime = field(default_factory=datetime.now)
+    # Monotonic baseline for uptime: immune to wall-clock jumps and
+    # cheaper to poll than constructing a datetime per read
+    _created_monotonic: float = field(
+        default_factory=time.monotonic, repr=False, compare=False)
+    
+    @property
+    def uptime(self) -> float:
+        """Get session uptime in seconds"""
+        return time.monotonic() - self._created_monotonic
+
+
+@dataclass(slots=True)
+class CaptureConfiguration:
+    """Audio capture configuration"""
+    device: Optional[AudioDevice] = None
+    format: Optional[AudioFormat] = None
+    buffer_size: int = 1024
+    use_converting_collector: bool = False
+    target_format: Optional[AudioFormat] = None
+    # Sample rate pre-cast to int once at construction; the session
+    # start paths hand it to the device layer directly
+    _sample_rate_int: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.format is None:
+            self.format = AudioFormat.default_format()
+        self._sample_rate_int = int(self.format.sample_rate)
+        if self.use_converting_collector and self.target_format is None:
+            # Default target format: 48kHz stereo
+            self.target_format = AudioFormat(
+                sample_rate=48000.0,
+                channels=2,
+                bit_depth=32,
+                is_float=True,
+                is_interleaved=True
+            )
+
+
+@dataclass(slots=True)
+class PlaybackConfiguration:
+    """Audio playback configuration"""
+    device: Optional[AudioDevice] = None
+    format: Optional[AudioFormat] = None
+    volume: float = 1.0
+    delay: float = 0.0
+    buffer_size: int = 1024
+    _sample_rate_int: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.format is None:
+            self.format = AudioFormat.default_format()
+        self.volume = max(0.0, min(1.0, self.volume))
+        self.delay = max(0.0, self.delay)
+        self._sample_rate_int = int(self.format.sample_rate)
+
+
+class AudioStreamMultiplexer(AudioStreamDelegate):
+    """Distributes audio to multiple outputs"""
+    
+    def __init__(self, converting_collector: Optional[ConvertingBufferCollector] = None):
+        """
+        Initialize audio stream multiplexer.
+        
+        Args:
+            converting_collector: Optional ConvertingBufferCollector for sample rate conversion
+        """
+        # Insertion-ordered dict keyed by object identity: O(1)
+        # membership on add/remove while preserving fan-out order
+        self._outputs: Dict[int, AudioOutput] = {}
+        # Copy-on-write iteration snapshot: rebuilt only when outputs
+        # change, so the per-buffer callbacks read a shared immutable
+        # tuple instead of allocating a list copy under the lock
+        self._outputs_snapshot: tuple = ()
+        self._is_paused = False
+        self._buffer_count = 0
+        self._error_count = 0
+        # Synchronous lock: the critical sections are short list
+        # mutations, so there is no reason to route them through the
+        # event loop the way an asyncio.Lock would
+        self._lock = threading.Lock()
+        self._converting_collector = converting_collector
+        # Per-output bounded queues drained by dedicated worker tasks.
+        # Both live on the receive loop and are reconciled lazily
+        # against the registry (tracked by a version counter), so the
+        # sync mutators never have to touch asyncio objects
+        self._output_queues: Dict[int, asyncio.Queue] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._registry_version = 0
+        self._workers_version = -1
+        # Fan-out copies of pool-owned capture frames, recycled once
+        # the last worker has processed them
+        self._pool = AudioBufferPool()
+    
+    def add_output(self, output: AudioOutput) -> None:
+        """Add an output"""
+        key = id(output)
+        with self._lock:
+            # Single identity-hash probe covers both the membership
+            # test and the insert
+            if self._outputs.setdefault(key, output) is output \
+                    and len(self._outputs) != len(self._outputs_snapshot):
+                self._outputs_snapshot = tuple(self._outputs.values())
+                self._registry_version += 1
+    
+    def remove_output(self, output: AudioOutput) -> None:
+        """Remove an output"""
+        with self._lock:
+            if self._outputs.pop(id(output), None) is not None:
+                self._outputs_snapshot = tuple(self._outputs.values())
+                self._registry_version += 1
+    
+    def remove_all_outputs(self) -> None:
+        """Remove all outputs"""
+        with self._lock:
+            self._outputs.clear()
+            self._outputs_snapshot = ()
+            self._registry_version += 1
+    
+    def set_paused(self, paused: bool) -> None:
+        """Set paused state"""
+        self._is_paused = paused
+    
+    async def audio_streamer_did_receive(self, streamer: StreamingAudioRecorder, buffer: AudioBuffer):
+        """Handle received audio buffer"""
+        if self._is_paused:
+            return
+        
+        self._buffer_count += 1
+        
+        # Add to ConvertingBufferCollector if configured; the
+        # collector retains what it is given (pass-through conversions
+        # do not copy), so a pool-owned frame is detached first
+        if self._converting_collector:
+            collected = buffer
+            if getattr(buffer, 'pool_owned', False):
+                collected = AudioBuffer(
+                    buffer.data.copy(), buffer.format, buffer.timestamp)
+            self._converting_collector.add_buffer(collected)
+        
+        # Distribute to all outputs; reading the snapshot tuple is
+        # GIL-atomic, so no lock and no allocation on the hot path
+        outputs = self._outputs_snapshot
+        if not outputs and not self._workers:
+            return
+        
+        # Reconcile queues and workers whenever the registry changed
+        if self._workers_version != self._registry_version:
+            self._sync_workers(outputs)
+        if not outputs:
+            return
+        
+        # Consumption is deferred to the workers, so a pool-owned
+        # capture frame is detached into a multiplexer-owned pooled
+        # array; the last worker to finish recycles it
+        if getattr(buffer, 'pool_owned', False):
+            data = self._pool.acquire(buffer.data.shape, buffer.data.dtype)
+            np.copyto(data, buffer.data)
+            buffer = AudioBuffer(data, buffer.format, buffer.timestamp)
+            # The copy is pool-backed too: outputs that retain buffers
+            # past process() must still see the flag and detach
+            buffer.pool_owned = True
+            buffer.mux_refs = len(outputs)
+        
+        queues = self._output_queues
+        for output in outputs:
+            queue = queues[id(output)]
+            try:
+                queue.put_nowait(buffer)
+            except asyncio.QueueFull:
+                # Bounded backpressure: a slow output loses its own
+                # oldest buffer; the others are unaffected
+                try:
+                    dropped = queue.get_nowait()
+                    queue.task_done()
+                    self._release_buffer(dropped)
+                except asyncio.QueueEmpty:
+                    pass
+                queue.put_nowait(buffer)
+    
+    def _sync_workers(self, outputs: tuple) -> None:
+        """Reconcile per-output queues and worker tasks with the registry"""
+        alive = {id(output) for output in outputs}
+        for key in [k for k in self._workers if k not in alive]:
+            self._workers[key].cancel()
+            self._retire_worker(key)
+        for output in outputs:
+            key = id(output)
+            if key not in self._workers:
+                queue = asyncio.Queue(maxsize=_OUTPUT_QUEUE_DEPTH)
+                self._output_queues[key] = queue
+                self._workers[key] = asyncio.create_task(
+                    self._output_worker(output, queue))
+        self._workers_version = self._registry_version
+    
+    async def _output_worker(self, output: AudioOutput, queue: asyncio.Queue) -> None:
+        """Drain one output's queue, isolating it from the others"""
+        failures = 0
+        while True:
+            buffer = await queue.get()
+            try:
+                await output.process(buffer)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                self._log_output_failure(output, e)
+                if failures >= _OUTPUT_FAILURE_LIMIT:
+                    # Persistently broken: retire the output instead of
+                    # paying exception unwinding on every future frame.
+                    # Tear down our own registry entries immediately —
+                    # an orphaned queue would hang the join() in
+                    # audio_streamer_did_finish until the next receive
+                    # happened to reap it.
+                    logger.warning(
+                        "Output %s retired after %d consecutive failures",
+                        output.id, failures)
+                    self.remove_output(output)
+                    self._retire_worker(id(output))
+                    return
+            finally:
+                self._release_buffer(buffer)
+                queue.task_done()
+    
+    def _retire_worker(self, key: int) -> None:
+        """Drop a worker's queue and registry entries, releasing any
+        queued fan-out copies"""
+        self._workers.pop(key, None)
+        queue = self._output_queues.pop(key, None)
+        if queue is None:
+            return
+        while True:
+            try:
+                buffer = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            queue.task_done()
+            self._release_buffer(buffer)
+    
+    def _release_buffer(self, buffer: AudioBuffer) -> None:
+        """Drop one worker's claim on a pooled fan-out copy"""
+        refs = getattr(buffer, 'mux_refs', 0)
+        if refs:
+            buffer.mux_refs = refs - 1
+            if refs == 1:
+                self._pool.release(buffer.data)
+    
+    @property
+    def buffer_count(self) -> int:
+        """Number of buffers received so far"""
+        return self._buffer_count
+    
+    def _log_output_failure(self, output: AudioOutput, error: Exception) -> None:
+        """Log a per-buffer output failure, rate-limited under storms"""
+        self._error_count += 1
+        count = self._error_count
+        if count <= _ERROR_LOG_THRESHOLD or count % _ERROR_LOG_INTERVAL == 0:
+            logger.error("Output %s failed to process buffer (failure %d): %s",
+                         output.id, count, error)
+    
+    async def audio_streamer_did_encounter_error(self, streamer: StreamingAudioRecorder, error: Exception):
+        """Handle error from streamer"""
+        outputs = self._outputs_snapshot
+        if not outputs:
+            return
+        # Generator unpack feeds gather without an intermediate list;
+        # return_exceptions keeps one failing handler from masking the
+        # rest
+        await asyncio.gather(
+            *(output.handle_error(error) for output in outputs),
+            return_exceptions=True
+        )
+    
+    async def audio_streamer_did_finish(self, streamer: StreamingAudioRecorder):
+        """Handle streamer finish"""
+        # Let the workers drain their queues so no tail audio is lost,
+        # then retire them before finishing the outputs
+        for queue in self._output_queues.values():
+            await queue.join()
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._output_queues.clear()
+        self._workers_version = -1
+        
+        for output in self._outputs_snapshot:
+            try:
+                await output.finish()
+            except Exception:
+                pass
+
+
+class BaseAudioSession:
+    """Base class for audio sessions"""
+    
+    # Observer handles are internal: a process-wide counter is ~100x
+    # cheaper than uuid4's entropy read per registration
+    _observer_id_counter = itertools.count(1)
+    
+    def __init__(self):
+        """Initialize base audio session"""
+        self.id = uuid.uuid4()
+        self.created_at = datetime.now()
+        self._state = SessionState.IDLE
+        self._statistics = SessionStatistics(
+            session_id=self.id,
+            state=SessionState.IDLE,
+            buffer_count=0,
+            duration=0.0,
+            format=None,
+            created_at=self.created_at
+        )
+        self._state_observers: Dict[int, Callable[[SessionState], None]] = {}
+        # Copy-on-write observer snapshot: rebuilt on add/remove under
+        # a sync lock, read lock-free on the frequent state updates
+        self._observers_snapshot: tuple = ()
+        self._error_handler: Optional[Callable[[Exception], None]] = None
+        self._state_lock = threading.Lock()
+        # Hot-path counter kept as a plain attribute; folded into the
+        # statistics object only when a snapshot is requested
+        self._buffer_count_fast = 0
+    
+    async def update_state(self, new_state: SessionState) -> None:
+        """Update session state"""
+        # Redundant transitions are no-ops; enum members are singletons
+        # so identity comparison suffices
+        if new_state is self._state:
+            return
+        
+        # Both writes are GIL-atomic and observers are read from the
+        # immutable snapshot, so no lock is taken on the update path
+        self._state = new_state
+        self._statistics.state = new_state
+        
+        # Headless pipelines register no observers; the transition is
+        # then just the two writes above
+        observers = self._observers_snapshot
+        if not observers:
+            return
+        
+        # Observers run on the next loop tick so a slow callback never
+        # stalls the state transition itself
+        loop = asyncio.get_running_loop()
+        for observer in observers:
+            loop.call_soon(self._notify_observer, observer, new_state)
+    
+    @staticmethod
+    def _notify_observer(observer: Callable[[SessionState], None],
+                         new_state: SessionState) -> None:
+        """Invoke one observer, containing its failures"""
+        try:
+            observer(new_state)
+        except Exception as e:
+            logger.error("State observer error: %s", e)
+    
+    def add_state_observer(self, observer: Callable[[SessionState], None]) -> int:
+        """
+        Add state observer.
+        
+        Args:
+            observer: Callback function for state changes
+            
+        Returns:
+            Observer ID for removal
+        """
+        observer_id = next(self._observer_id_counter)
+        with self._state_lock:
+            self._state_observers[observer_id] = observer
+            self._observers_snapshot = tuple(self._state_observers.values())
+        return observer_id
+    
+    def remove_state_observer(self, observer_id: int) -> None:
+        """Remove state observer"""
+        with self._state_lock:
+            if self._state_observers.pop(observer_id, None) is not None:
+                self._observers_snapshot = tuple(self._state_observers.values())
+    
+    def set_error_handler(self, handler: Callable[[Exception], None]) -> None:
+        """Set error handler"""
+        self._error_handler = handler
+    
+    async def handle_error(self, error: Exception) -> None:
+        """Handle error"""
+        await self.update_state(SessionState.ERROR)
+        if self._error_handler:
+            try:
+                self._error_handler(error)
+            except Exception:
+                pass
+    
+    def get_statistics(self) -> SessionStatistics:
+        """
+        Get a snapshot of session statistics.
+        
+        Returns:
+            A shallow copy, so callers cannot mutate the live counters
+        """
+        self._statistics.buffer_count = self._buffer_count_fast
+        return replace(self._statistics)
+    
+    @property
+    def state(self) -> SessionState:
+        """Get current state"""
+        return self._state
+
+
+class AudioCaptureSession(BaseAudioSession):
+    """Manages an audio capture session"""
+    
+    def __init__(self, configuration: CaptureConfiguration):
+        """
+        Initialize audio capture session.
+        
+        Args:
+            configuration: Capture configuration
+        """
+        super().__init__()
+        self._configuration = configuration
+        self._recorder: Optional[StreamingAudioRecorder] = None
+        self._outputs: Dict[int, AudioOutput] = {}
+        self._outputs_snapshot: tuple = ()
+        self._session_format = configuration.format
+        self._converting_collector: Optional[ConvertingBufferCollector] = None
+        
+        # Initialize ConvertingBufferCollector if requested
+        if configuration.use_converting_collector:
+            self._converting_collector = ConvertingBufferCollector(
+                input_format=configuration.format,
+                target_format=configuration.target_format
+            )
+        
+        # Create multiplexer with optional collector
+        self._multiplexer = AudioStreamMultiplexer(self._converting_collector)
+    
+    async def start(self) -> None:
+        """Start capture session"""
+        if self._state not in (SessionState.IDLE, SessionState.STOPPED):
+            raise InvalidStateError("Session is already active")
+        
+        await self.update_state(SessionState.STARTING)
+        
+        try:
+            # Create recorder; the config pre-cast the sample rate
+            fmt = self._session_format
+            config = self._configuration
+            self._recorder = StreamingAudioRecorder(
+                sample_rate=config._sample_rate_int,
+                channels=fmt.channel_count,
+                blocksize=config.buffer_size,
+                device=config.device
+            )
+            
+            # Set up multiplexer as delegate
+            self._recorder.add_delegate(self._multiplexer)
+            
+            # Start recording
+            await self._recorder.start_streaming()
+            
+            # Update statistics
+            self._statistics.format = self._session_format
+            
+            await self.update_state(SessionState.ACTIVE)
+            
+        except Exception as e:
+            await self.handle_error(e)
+            raise
+    
+    async def stop(self) -> None:
+        """Stop capture session"""
+        if self._state not in (SessionState.ACTIVE, SessionState.PAUSED):
+            raise InvalidStateError("Session is not active")
+        
+        await self.update_state(SessionState.STOPPING)
+        
+        # Stop recorder
+        if self._recorder:
+            await self._recorder.stop_streaming()
+        
+        # Notify outputs
+        for output in self._outputs.values():
+            try:
+                await output.finish()
+            except Exception:
+                pass
+        
+        # Clear outputs
+        self._outputs.clear()
+        self._outputs_snapshot = ()
+        self._multiplexer.remove_all_outputs()
+        
+        await self.update_state(SessionState.STOPPED)
+    
+    async def pause(self) -> None:
+        """Pause capture session"""
+        if self._state != SessionState.ACTIVE:
+            raise InvalidStateError("Session is not active")
+        
+        await self.update_state(SessionState.PAUSED)
+        self._multiplexer.set_paused(True)
+    
+    async def resume(self) -> None:
+        """Resume capture session"""
+        if self._state != SessionState.PAUSED:
+            raise InvalidStateError("Session is not paused")
+        
+        self._multiplexer.set_paused(False)
+        await self.update_state(SessionState.ACTIVE)
+    
+    async def add_output(self, output: AudioOutput) -> None:
+        """
+        Add an output to the session.
+        
+        Args:
+            output: Audio output to add
+        """
+        if self._state not in (SessionState.ACTIVE, SessionState.PAUSED):
+            raise InvalidStateError("Session must be active to add outputs")
+        
+        # Configure output with session format
+        if self._session_format:
+            await output.configure(self._session_format)
+        
+        # Add to multiplexer
+        self._multiplexer.add_output(output)
+        
+        # Track output
+        self._outputs[id(output)] = output
+        self._outputs_snapshot = tuple(self._outputs.values())
+    
+    async def remove_output(self, output: AudioOutput) -> None:
+        """Remove an output from the session"""
+        self._multiplexer.remove_output(output)
+        if self._outputs.pop(id(output), None) is not None:
+            self._outputs_snapshot = tuple(self._outputs.values())
+        await output.finish()
+    
+    def get_outputs(self) -> tuple:
+        """
+        Get all active outputs.
+        
+        Returns:
+            Immutable snapshot tuple; rebuilt only when outputs change
+        """
+        return self._outputs_snapshot
+    
+    def get_statistics(self) -> SessionStatistics:
+        """Get a snapshot of session statistics"""
+        # The multiplexer counts received buffers; pull its total into
+        # the snapshot rather than incrementing per frame here
+        self._buffer_count_fast = self._multiplexer.buffer_count
+        return super().get_statistics()
+    
+    def get_configuration(self) -> CaptureConfiguration:
+        """Get session configuration"""
+        return self._configuration
+    
+    def get_format(self) -> Optional[AudioFormat]:
+        """Get session format"""
+        return self._session_format
+    
+    def get_converting_collector(self) -> Optional[ConvertingBufferCollector]:
+        """Get the converting buffer collector if configured"""
+        return self._converting_collector
+    
+    async def get_collected_audio(self) -> Optional[np.ndarray]:
+        """
+        Get all collected audio from the ConvertingBufferCollector.
+        
+        Returns:
+            Converted audio data or None if collector not configured
+        """
+        if self._converting_collector:
+            return self._converting_collector.get_all_audio()
+        return None
+
+
+class AudioPlaybackSession(BaseAudioSession):
+    """Manages an audio playback session"""
+    
+    def __init__(self, configuration: PlaybackConfiguration):
+        """
+        Initialize audio playback session.
+        
+        Args:
+            configuration: Playback configuration
+        """
+        super().__init__()
+        self._configuration = configuration
+        self._player: Optional[StreamingAudioPlayer] = None
+        self._input_source = None
+        self._session_format = configuration.format
+    
+    async def start(self) -> None:
+        """Start playback session"""
+        if self._state not in (SessionState.IDLE, SessionState.STOPPED):
+            raise InvalidStateError("Session is already active")
+        
+        await self.update_state(SessionState.STARTING)
+        
+        try:
+            # Create player; the config pre-cast the sample rate
+            fmt = self._session_format
+            config = self._configuration
+            device_index = config.device.device_index if config.device else None
+            self._player = StreamingAudioPlayer(
+                sample_rate=config._sample_rate_int,
+                channels=fmt.channel_count,
+                device_index=device_index,
+                delay=config.delay,
+                blocksize=config.buffer_size
+            )
+            
+            # Set volume
+            self._player.set_volume(config.volume)
+            
+            # Start playback
+            await self._player.start_playback()
+            
+            # Update statistics
+            self._statistics.format = self._session_format
+            
+            await self.update_state(SessionState.ACTIVE)
+            
+        except Exception as e:
+            await self.handle_error(e)
+            raise
+    
+    async def stop(self) -> None:
+        """Stop playback session"""
+        if self._state not in (SessionState.ACTIVE, SessionState.PAUSED):
+            raise InvalidStateError("Session is not active")
+        
+        await self.update_state(SessionState.STOPPING)
+        
+        # Stop player
+        if self._player:
+            await self._player.stop_playback()
+        
+        # Disconnect input
+        if self._input_source:
+            await self._input_source.disconnect()
+        
+        await self.update_state(SessionState.STOPPED)
+    
+    async def pause(self) -> None:
+        """Pause playback session"""
+        if self._state != SessionState.ACTIVE:
+            raise InvalidStateError("Session is not active")
+        
+        # TODO: Implement pause in StreamingAudioPlayer
+        await self.update_state(SessionState.PAUSED)
+    
+    async def resume(self) -> None:
+        """Resume playback session"""
+        if self._state != SessionState.PAUSED:
+            raise InvalidStateError("Session is not paused")
+        
+        # TODO: Implement resume in StreamingAudioPlayer
+        await self.update_state(SessionState.ACTIVE)
+    
+    async def schedule_buffer(self, buffer: AudioBuffer) -> None:
+        """Schedule a buffer for playback"""
+        if not self._player:
+            raise InvalidStateError("Player not initialized")
+        
+        await self._player.schedule_buffer(buffer.data)
+        self._buffer_count_fast += 1
+    
+    def set_volume(self, volume: float) -> None:
+        """Set playback volume (0.0 to 1.0)"""
+        if self._player:
+            self._player.set_volume(volume)
+    
+    def get_volume(self) -> float:
+        """Get current volume"""
+        if self._player:
+            return self._player.get_volume()
+        return self._configuration.volume
+    
+    def get_configuration(self) -> PlaybackConfiguration:
+        """Get session configuration"""
+        return self._configuration
+    
+    def get_format(self) -> Optional[AudioFormat]:
+        """Get session format"""
         return self._session_format
\ No newline at end of file
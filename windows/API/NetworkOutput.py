@@ -1,532 +1,809 @@
-"""
-NetworkOutput - Streams audio over TCP/IP network
-
-This module creates a TCP server that streams audio buffers to connected clients.
-It's designed for inter-process communication, particularly with Python clients
-that want to receive real-time audio.
-
-Protocol:
-- Header: Format information (sent once per connection)
-- Packets: Audio data with timestamps
-"""
-
-import asyncio
-import struct
-import time
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Set, AsyncIterator
-import numpy as np
-
-from .AudioFormat import AudioFormat, AudioBuffer
-from .AudioError import NetworkConnectionFailedError, StreamingProtocolError
-
-
-# Protocol constants
-PROTOCOL_MAGIC = b'AUDIO'
-PROTOCOL_VERSION = 1
-PACKET_TYPE_AUDIO = 0x01
-PACKET_TYPE_FORMAT = 0x02
-PACKET_TYPE_END = 0xFF
-
-
-@dataclass
-class NetworkStatistics:
-    """Network streaming statistics"""
-    connection_count: int
-    packets_sent: int
-    bytes_sent: int
-    duration: float
-    throughput_mbps: float
-
-
-class NetworkAudioServer:
-    """TCP server for streaming audio to network clients"""
-    
-    def __init__(
-        self,
-        host: str = "0.0.0.0",
-        port: int = 9876,
-        format: Optional[AudioFormat] = None
-    ):
-        """
-        Initialize network audio server.
-        
-        Args:
-            host: Host address to bind to
-            port: Port number to listen on
-            format: Audio format (can be set later)
-        """
-        self.host = host
-        self.port = port
-        self.format = format
-        
-        # Server state
-        self._server = None
-        self._clients: Set[asyncio.StreamWriter] = set()
-        self._is_running = False
-        
-        # Statistics
-        self._packets_sent = 0
-        self._bytes_sent = 0
-        self._start_time = time.time()
-        
-        # Lock for client list
-        self._clients_lock = asyncio.Lock()
-    
-    async def start(self) -> None:
-        """Start the TCP server"""
-        if self._is_running:
-            return
-        
-        self._server = await asyncio.start_server(
-            self._handle_client,
-            self.host,
-            self.port
-        )
-        
-        self._is_running = True
-        self._start_time = time.time()
-        
-        # Get actual port if 0 was specified
-        actual_port = self._server.sockets[0].getsockname()[1]
-        print(f"NetworkOutput: Started TCP server on {self.host}:{actual_port}")
-    
-    async def stop(self) -> None:
-        """Stop the TCP server"""
-        if not self._is_running:
-            return
-        
-        # Send end packet to all clients
-        end_packet = self._create_end_packet()
-        await self._broadcast_data(end_packet)
-        
-        # Close all client connections
-        async with self._clients_lock:
-            for writer in list(self._clients):
-                try:
-                    writer.close()
-                    await writer.wait_closed()
-                except Exception:
-                    pass
-            self._clients.clear()
-        
-        # Stop server
-        if self._server:
-            self._server.close()
-            await self._server.wait_closed()
-        
-        self._is_running = False
-        
-        # Print statistics
-        duration = time.time() - self._start_time
-        mb_sent = self._bytes_sent / (1024 * 1024)
-        print(f"NetworkOutput: Stopped")
-        print(f"  Packets sent: {self._packets_sent}")
-        print(f"  Data sent: {mb_sent:.2f} MB")
-        print(f"  Duration: {duration:.1f}s")
-        if duration > 0:
-            print(f"  Throughput: {mb_sent / duration:.2f} MB/s")
-    
-    async def set_format(self, format: AudioFormat) -> None:
-        """Set or update the audio format"""
-        self.format = format
-        
-        # Send format header to all connected clients
-        if self._is_running:
-            header = self._create_format_header(format)
-            await self._broadcast_data(header)
-    
-    async def broadcast_buffer(self, buffer: AudioBuffer) -> None:
-        """
-        Broadcast audio buffer to all connected clients.
-        
-        Args:
-            buffer: Audio buffer to broadcast
-        """
-        if not self._is_running:
-            raise NetworkConnectionFailedError("Server is not running")
-        
-        # Create audio packet
-        packet = self._create_audio_packet(buffer)
-        
-        # Send to all clients
-        await self._broadcast_data(packet)
-        
-        self._packets_sent += 1
-        self._bytes_sent += len(packet)
-    
-    async def _handle_client(
-        self,
-        reader: asyncio.StreamReader,
-        writer: asyncio.StreamWriter
-    ) -> None:
-        """Handle a new client connection"""
-        client_addr = writer.get_extra_info('peername')
-        print(f"NetworkOutput: New client connected from {client_addr}")
-        
-        # Add to client list
-        async with self._clients_lock:
-            self._clients.add(writer)
-        
-        try:
-            # Send format header if available
-            if self.format:
-                header = self._create_format_header(self.format)
-                writer.write(header)
-                await writer.drain()
-                print(f"NetworkOutput: Sent format header to {client_addr}")
-            
-            # Keep connection alive until client disconnects
-            while True:
-                # Read from client (for ping/keepalive)
-                try:
-                    data = await asyncio.wait_for(reader.read(1), timeout=30.0)
-                    if not data:
-                        break
-                except asyncio.TimeoutError:
-                    # Send keepalive
-                    try:
-                        writer.write(b'\x00')
-                        await writer.drain()
-                    except Exception:
-                        break
-                
-        except Exception as e:
-            print(f"NetworkOutput: Client error: {e}")
-        
-        finally:
-            # Remove from client list
-            async with self._clients_lock:
-                self._clients.discard(writer)
-            
-            # Close connection
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
-            
-            print(f"NetworkOutput: Client disconnected. Active connections: {len(self._clients)}")
-    
-    async def _broadcast_data(self, data: bytes) -> None:
-        """Broadcast data to all connected clients"""
-        disconnected = []
-        
-        async with self._clients_lock:
-            for writer in self._clients:
-                try:
-                    writer.write(data)
-                    await writer.drain()
-                except Exception as e:
-                    print(f"NetworkOutput: Failed to send to client: {e}")
-                    disconnected.append(writer)
-        
-        # Remove disconnected clients
-        if disconnected:
-            async with self._clients_lock:
-                for writer in disconnected:
-                    self._clients.discard(writer)
-                    try:
-                        writer.close()
-                        await writer.wait_closed()
-                    except Exception:
-                        pass
-    
-    def _create_format_header(self, format: AudioFormat) -> bytes:
-        """Create format header packet"""
-        header = bytearray()
-        
-        # Magic bytes
-        header.extend(PROTOCOL_MAGIC)
-        
-        # Version
-        header.append(PROTOCOL_VERSION)
-        
-        # Packet type
-        header.append(PACKET_TYPE_FORMAT)
-        
-        # Sample rate (4 bytes, little-endian)
-        header.extend(struct.pack('<I', int(format.sample_rate)))
-        
-        # Channels (2 bytes, little-endian)
-        header.extend(struct.pack('<H', format.channel_count))
-        
-        # Bit depth (2 bytes, little-endian)
-        header.extend(struct.pack('<H', format.bit_depth))
-        
-        # Format flags (4 bytes, little-endian)
-        flags = 0
-        if format.is_float:
-            flags |= 0x01
-        if format.is_interleaved:
-            flags |= 0x02
-        header.extend(struct.pack('<I', flags))
-        
-        return bytes(header)
-    
-    def _create_audio_packet(self, buffer: AudioBuffer) -> bytes:
-        """Create audio data packet"""
-        packet = bytearray()
-        
-        # Packet type
-        packet.append(PACKET_TYPE_AUDIO)
-        
-        # Timestamp (8 bytes, microseconds since start)
-        timestamp_us = int((time.time() - self._start_time) * 1_000_000)
-        packet.extend(struct.pack('<Q', timestamp_us))
-        
-        # Frame count (4 bytes)
-        frame_count = buffer.frame_count
-        packet.extend(struct.pack('<I', frame_count))
-        
-        # Audio data
-        audio_data = self._extract_audio_data(buffer)
-        packet.extend(audio_data)
-        
-        return bytes(packet)
-    
-    def _create_end_packet(self) -> bytes:
-        """Create end-of-stream packet"""
-        packet = bytearray()
-        
-        # Packet type
-        packet.append(PACKET_TYPE_END)
-        
-        # Final timestamp
-        timestamp_us = int((time.time() - self._start_time) * 1_000_000)
-        packet.extend(struct.pack('<Q', timestamp_us))
-        
-        return bytes(packet)
-    
-    def _extract_audio_data(self, buffer: AudioBuffer) -> bytes:
-        """Extract audio data from buffer for network transport"""
-        data = buffer.data
-        format = buffer.format
-        
-        # Ensure data is in the correct format for transport
-        if format.is_float:
-            # Float32 format
-            if format.is_interleaved or data.ndim == 1:
-                # Already interleaved or mono
-                return data.astype('<f4').tobytes()
-            else:
-                # Non-interleaved - need to interleave
-                interleaved = buffer.to_interleaved()
-                return interleaved.data.astype('<f4').tobytes()
-        else:
-            # Integer format
-            if format.bit_depth == 16:
-                dtype = '<i2'
-            elif format.bit_depth == 32:
-                dtype = '<i4'
-            else:
-                dtype = '<i4'  # Default to 32-bit
-            
-            if format.is_interleaved or data.ndim == 1:
-                return data.astype(dtype).tobytes()
-            else:
-                interleaved = buffer.to_interleaved()
-                return interleaved.data.astype(dtype).tobytes()
-    
-    def get_connection_count(self) -> int:
-        """Get current number of connected clients"""
-        return len(self._clients)
-    
-    def get_statistics(self) -> NetworkStatistics:
-        """Get network statistics"""
-        duration = time.time() - self._start_time
-        throughput_mbps = (self._bytes_sent / (1024 * 1024) / duration) if duration > 0 else 0
-        
-        return NetworkStatistics(
-            connection_count=len(self._clients),
-            packets_sent=self._packets_sent,
-            bytes_sent=self._bytes_sent,
-            duration=duration,
-            throughput_mbps=throughput_mbps
-        )
-
-
-class NetworkAudioClient:
-    """TCP client for receiving audio from network server"""
-    
-    def __init__(self, host: str = "localhost", port: int = 9876):
-        """
-        Initialize network audio client.
-        
-        Args:
-            host: Server host address
-            port: Server port number
-        """
-        self.host = host
-        self.port = port
-        
-        self._reader = None
-        self._writer = None
-        self._format = None
-        self._is_connected = False
-    
-    async def connect(self) -> AudioFormat:
-        """
-        Connect to audio server and receive format header.
-        
-        Returns:
-            Audio format from server
-        """
-        if self._is_connected:
-            return self._format
-        
-        try:
-            self._reader, self._writer = await asyncio.open_connection(
-                self.host, self.port
-            )
-            
-            # Read format header
-            header = await self._read_format_header()
-            self._format = header
-            self._is_connected = True
-            
-            print(f"NetworkAudioClient: Connected to {self.host}:{self.port}")
-            print(f"  Format: {self._format.description}")
-            
-            return self._format
-            
-        except Exception as e:
-            raise NetworkConnectionFailedError(f"Failed to connect: {e}")
-    
-    async def disconnect(self) -> None:
-        """Disconnect from server"""
-        if not self._is_connected:
-            return
-        
-        if self._writer:
-            self._writer.close()
-            await self._writer.wait_closed()
-        
-        self._reader = None
-        self._writer = None
-        self._is_connected = False
-        
-        print("NetworkAudioClient: Disconnected")
-    
-    async def receive_audio(self) -> AsyncIterator[AudioBuffer]:
-        """
-        Receive audio buffers from server.
-        
-        Yields:
-            Audio buffers as they arrive
-        """
-        if not self._is_connected:
-            raise NetworkConnectionFailedError("Not connected to server")
-        
-        while self._is_connected:
-            try:
-                # Read packet type
-                packet_type = await self._reader.read(1)
-                if not packet_type:
-                    break
-                
-                packet_type = packet_type[0]
-                
-                if packet_type == PACKET_TYPE_AUDIO:
-                    # Read audio packet
-                    buffer = await self._read_audio_packet()
-                    if buffer:
-                        yield buffer
-                        
-                elif packet_type == PACKET_TYPE_END:
-                    # End of stream
-                    await self._reader.read(8)  # Skip timestamp
-                    break
-                    
-                elif packet_type == 0x00:
-                    # Keepalive - ignore
-                    continue
-                    
-                else:
-                    print(f"NetworkAudioClient: Unknown packet type: {packet_type}")
-                    
-            except Exception as e:
-                print(f"NetworkAudioClient: Receive error: {e}")
-                break
-        
-        await self.disconnect()
-    
-    async def _read_format_header(self) -> AudioFormat:
-        """Read and parse format header"""
-        # Read magic bytes
-        magic = await self._reader.read(len(PROTOCOL_MAGIC))
-        if magic != PROTOCOL_MAGIC:
-            raise StreamingProtocolError("Invalid protocol magic")
-        
-        # Read version
-        version = await self._reader.read(1)
-        if version[0] != PROTOCOL_VERSION:
-            raise StreamingProtocolError(f"Unsupported protocol version: {version[0]}")
-        
-        # Read packet type
-        packet_type = await self._reader.read(1)
-        if packet_type[0] != PACKET_TYPE_FORMAT:
-            raise StreamingProtocolError("Expected format packet")
-        
-        # Read format data
-        format_data = await self._reader.read(14)  # 4 + 2 + 2 + 4 bytes
-        
-        sample_rate, channels, bit_depth, flags = struct.unpack('<IHHI', format_data)
-        
-        is_float = bool(flags & 0x01)
-        is_interleaved = bool(flags & 0x02)
-        
-        return AudioFormat(
-            sample_rate=float(sample_rate),
-            channel_count=channels,
-            bit_depth=bit_depth,
-            is_interleaved=is_interleaved,
-            is_float=is_float
-        )
-    
-    async def _read_audio_packet(self) -> Optional[AudioBuffer]:
-        """Read and parse audio packet"""
-        # Read header
-        header = await self._reader.read(12)  # 8 + 4 bytes
-        if len(header) < 12:
-            return None
-        
-        timestamp_us, frame_count = struct.unpack('<QI', header)
-        
-        # Calculate data size
-        bytes_per_sample = self._format.bit_depth // 8
-        total_samples = frame_count * self._format.channel_count
-        data_size = total_samples * bytes_per_sample
-        
-        # Read audio data
-        audio_data = await self._reader.read(data_size)
-        if len(audio_data) < data_size:
-            return None
-        
-        # Convert to numpy array
-        if self._format.is_float:
-            dtype = '<f4' if self._format.bit_depth == 32 else '<f8'
-        else:
-            if self._format.bit_depth == 16:
-                dtype = '<i2'
-            elif self._format.bit_depth == 32:
-                dtype = '<i4'
-            else:
-                dtype = '<i4'
-        
-        samples = np.frombuffer(audio_data, dtype=dtype)
-        
-        # Reshape based on format
-        if self._format.is_interleaved and self._format.channel_count > 1:
-            # Reshape from interleaved to (frames, channels)
-            samples = samples.reshape(-1, self._format.channel_count)
-        
-        # Create timestamp
-        timestamp = datetime.fromtimestamp(self._start_time + timestamp_us / 1_000_000)
-        
-        return AudioBuffer(
-            data=samples,
-            format=self._format,
-            timestamp=timestamp
+"""
+NetworkOutput - Streams audio over TCP/IP network
+
+This module creates a TCP server that streams audio buffers to connected clients.
+It's designed for inter-process communication, particularly with Python clients
+that want to receive real-time audio.
+
+Protocol:
+- Header: Format information (sent once per connection)
+- Packets: Audio data with timestamps
+
+Transport notes:
+- Fan-out is queue-per-client: one serialized packet is shared across
+  all subscriber queues and written via scatter/gather fragments, so
+  send-side cost is one serialization per buffer regardless of client
+  count.
+- The server rides whatever event loop the application provides
+  (Proactor/IOCP on Windows, selector or uvloop elsewhere); all
+  batching happens above the loop in the sender tasks.
+"""
+
+import asyncio
+import logging
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, AsyncIterator
+import numpy as np
+
+try:
+    import blosc
+except ImportError:
+    blosc = None
+
+from .AudioFormat import AudioFormat, AudioBuffer
+from .AudioError import NetworkConnectionFailedError, StreamingProtocolError
+
+logger = logging.getLogger(__name__)
+
+
+# Protocol constants
+PROTOCOL_MAGIC = b'AUDIO'
+PROTOCOL_VERSION = 1
+PACKET_TYPE_AUDIO = 0x01
+PACKET_TYPE_FORMAT = 0x02
+PACKET_TYPE_AUDIO_COMPRESSED = 0x03
+PACKET_TYPE_END = 0xFF
+
+# Pre-compiled wire structs; struct.Struct skips the per-call format
+# string parse and cache lookup that module-level struct.pack pays
+_AUDIO_HEADER = struct.Struct('<BQI')        # type, timestamp_us, frames
+_COMPRESSED_HEADER = struct.Struct('<BQII')  # + compressed size
+_END_PACKET = struct.Struct('<BQ')           # type, timestamp_us
+_FORMAT_HEADER = struct.Struct('<5sBBIHHI')  # magic..flags, one pack
+_FORMAT_BODY = struct.Struct('<IHHI')        # rate, channels, depth, flags
+_AUDIO_BODY = struct.Struct('<QI')           # header minus the type byte
+_COMPRESSED_BODY = struct.Struct('<QII')
+
+
+def enable_uvloop() -> bool:
+    """
+    Install uvloop as the asyncio event loop policy, if available.
+
+    uvloop roughly halves the per-packet event loop overhead of the
+    streaming paths, but it only exists on POSIX platforms — on
+    Windows (this library's primary target) or when the package is
+    not installed this is a no-op. Call before creating the event
+    loop; opt-in because the loop policy belongs to the application,
+    not to a library import.
+
+    Returns:
+        True if uvloop was installed, False otherwise
+    """
+    if sys.platform == 'win32':
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+class _ClientSender:
+    """
+    Per-subscriber send queue drained by its own task.
+
+    Broadcasts enqueue packets here without awaiting, so one slow or
+    stalled client never back-pressures the producer or the other
+    subscribers. The queue is bounded with drop-oldest overflow —
+    a lagging client loses audio packets rather than stalling the
+    stream.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, max_pending: int = 64):
+        self.writer = writer
+        self.failed = False
+        self.packets_dropped = 0
+        self._pending = deque(maxlen=max_pending)
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def start(self) -> None:
+        """Start the drain task"""
+        self._task = asyncio.create_task(self._drain())
+
+    def send(self, data) -> None:
+        """Enqueue a packet (bytes or fragment list); never blocks"""
+        if len(self._pending) == self._pending.maxlen:
+            self.packets_dropped += 1
+        self._pending.append(data)
+        self._wakeup.set()
+
+    async def close(self) -> None:
+        """Flush queued packets, then stop the drain task"""
+        self._pending.append(None)
+        self._wakeup.set()
+        if self._task:
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _drain(self) -> None:
+        # Fragment lists go to the transport unjoined via writelines;
+        # the header and payload are never concatenated in userspace
+        writer = self.writer
+        pending = self._pending
+        wakeup = self._wakeup
+        try:
+            while True:
+                await wakeup.wait()
+                wakeup.clear()
+                while pending:
+                    # Coalesce everything queued into one vectored
+                    # write followed by a single drain, so a client
+                    # that fell behind catches up without paying a
+                    # drain round-trip per packet. Capped so one flush
+                    # never stages more than ~256 KiB in the transport.
+                    fragments = []
+                    batched = 0
+                    while pending and batched < 256 * 1024:
+                        data = pending.popleft()
+                        if data is None:
+                            if fragments:
+                                writer.writelines(fragments)
+                                await writer.drain()
+                            return
+                        if isinstance(data, (list, tuple)):
+                            fragments.extend(data)
+                            batched += sum(len(f) for f in data)
+                        else:
+                            fragments.append(data)
+                            batched += len(data)
+                    writer.writelines(fragments)
+                    await writer.drain()
+        except Exception as e:
+            logger.error("Failed to send to client: %s", e)
+            self.failed = True
+
+
+@dataclass
+class NetworkStatistics:
+    """Network streaming statistics"""
+    connection_count: int
+    packets_sent: int
+    bytes_sent: int
+    duration: float
+    throughput_mbps: float
+
+
+class NetworkAudioServer:
+    """TCP server for streaming audio to network clients"""
+    
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 9876,
+        format: Optional[AudioFormat] = None,
+        compression: Optional[str] = None,
+        transport_bit_depth: Optional[int] = None
+    ):
+        """
+        Initialize network audio server.
+        
+        Args:
+            host: Host address to bind to
+            port: Port number to listen on
+            format: Audio format (can be set later)
+            compression: Optional payload compression; 'blosc' enables
+                blosc/LZ4 with byte shuffling (requires the blosc
+                package). None streams raw samples.
+            transport_bit_depth: Quantize float audio to this depth on
+                the wire (only 16 supported); halves bandwidth at
+                ~96 dB dynamic range. None streams the native format.
+        """
+        if transport_bit_depth not in (None, 16):
+            raise ValueError(
+                f"Unsupported transport bit depth: {transport_bit_depth}")
+        self.host = host
+        self.port = port
+        self.format = format
+        self._transport_bit_depth = transport_bit_depth
+        self._quantize = False
+        self._quant_scratch = None
+        self._compress = False
+        if compression is not None:
+            if compression != 'blosc':
+                raise ValueError(f"Unsupported compression: {compression}")
+            if blosc is None:
+                logger.warning(
+                    "blosc not installed; streaming uncompressed audio")
+            else:
+                self._compress = True
+        
+        # Server state
+        self._server = None
+        self._clients: Dict[asyncio.StreamWriter, _ClientSender] = {}
+        # Immutable snapshot of (writer, sender) pairs, rebuilt under
+        # the lock on every connect/disconnect; broadcasts iterate it
+        # without taking the lock
+        self._senders_snapshot = ()
+        self._is_running = False
+        
+        # Transport constants derived from the format once (see
+        # _update_format_cache) instead of per packet
+        self._format_header_bytes = None
+        self._transport_dtype = None
+        self._needs_interleave = False
+        if format is not None:
+            self._update_format_cache(format)
+        
+        # Statistics
+        self._packets_sent = 0
+        self._bytes_sent = 0
+        self._start_time = time.time()
+        
+        # Lock for client list; a plain mutex because the guarded
+        # sections are pure dict/tuple mutation with no awaits, and it
+        # keeps registration usable from any thread
+        self._clients_lock = threading.Lock()
+    
+    async def start(self) -> None:
+        """Start the TCP server"""
+        if self._is_running:
+            return
+        
+        self._server = await asyncio.start_server(
+            self._handle_client,
+            self.host,
+            self.port
+        )
+        
+        self._is_running = True
+        self._start_time = time.time()
+        
+        # Get actual port if 0 was specified
+        actual_port = self._server.sockets[0].getsockname()[1]
+        print(f"NetworkOutput: Started TCP server on {self.host}:{actual_port}")
+    
+    async def stop(self) -> None:
+        """Stop the TCP server"""
+        if not self._is_running:
+            return
+        
+        # Send end packet to all clients
+        end_packet = self._create_end_packet()
+        await self._broadcast_data(end_packet)
+        
+        # Detach all clients under the lock, then close them outside
+        # it (closing awaits the drain tasks)
+        with self._clients_lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+            self._senders_snapshot = ()
+        for writer, sender in clients:
+            await sender.close()
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+        
+        # Stop server
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        
+        self._is_running = False
+        
+        # Print statistics
+        duration = time.time() - self._start_time
+        mb_sent = self._bytes_sent / (1024 * 1024)
+        print(f"NetworkOutput: Stopped")
+        print(f"  Packets sent: {self._packets_sent}")
+        print(f"  Data sent: {mb_sent:.2f} MB")
+        print(f"  Duration: {duration:.1f}s")
+        if duration > 0:
+            print(f"  Throughput: {mb_sent / duration:.2f} MB/s")
+    
+    async def set_format(self, format: AudioFormat) -> None:
+        """Set or update the audio format"""
+        self.format = format
+        self._update_format_cache(format)
+        
+        # Send format header to all connected clients
+        if self._is_running:
+            await self._broadcast_data(self._format_header_bytes)
+    
+    def _update_format_cache(self, format: AudioFormat) -> None:
+        """Precompute the header bytes and transport dtype for a format"""
+        wire_format = format
+        self._quantize = False
+        if format.is_float and self._transport_bit_depth == 16:
+            # Quantize floats to int16 on the wire; the header must
+            # advertise the transport format so clients decode it
+            dtype = '<i2'
+            self._quantize = True
+            wire_format = AudioFormat(
+                sample_rate=format.sample_rate,
+                channel_count=format.channel_count,
+                bit_depth=16,
+                is_interleaved=format.is_interleaved,
+                is_float=False
+            )
+        elif format.is_float:
+            dtype = '<f4'
+        elif format.bit_depth == 16:
+            dtype = '<i2'
+        else:
+            dtype = '<i4'  # Default to 32-bit
+        self._transport_dtype = np.dtype(dtype)
+        self._needs_interleave = (
+            not format.is_interleaved and format.channel_count > 1)
+        self._format_header_bytes = self._create_format_header(wire_format)
+    
+    async def broadcast_buffer(self, buffer: AudioBuffer) -> None:
+        """
+        Broadcast audio buffer to all connected clients.
+        
+        Args:
+            buffer: Audio buffer to broadcast
+        """
+        if not self._is_running:
+            raise NetworkConnectionFailedError("Server is not running")
+        
+        # Serialize exactly once per broadcast; every subscriber queue
+        # shares the same header and payload objects
+        header, payload = self._serialize_packet(buffer)
+        
+        # Send to all clients
+        await self._broadcast_data([header, payload])
+        
+        self._packets_sent += 1
+        self._bytes_sent += len(header) + len(payload)
+    
+    def _serialize_packet(self, buffer: AudioBuffer):
+        """
+        Serialize a buffer into its wire form: (header, payload).
+
+        Called once per broadcast regardless of client count. The
+        returned payload is safe to share across the sender queues —
+        it is materialized (or freshly allocated by quantization or
+        compression) before this returns, never a view of the
+        caller's live array.
+        """
+        payload, owned = self._extract_audio_data(buffer)
+        if self._compress:
+            # Byte-shuffled LZ4 trades a little CPU for a lot of
+            # bandwidth on audio; fall back to raw when a block does
+            # not shrink
+            compressed = blosc.compress(
+                payload, typesize=self._transport_dtype.itemsize,
+                cname='lz4', clevel=1)
+            if len(compressed) < len(payload):
+                header = self._create_audio_header(
+                    buffer, compressed_size=len(compressed))
+                return header, compressed
+        header = self._create_audio_header(buffer)
+        if not owned:
+            payload = bytes(payload)
+        return header, payload
+    
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle a new client connection"""
+        client_addr = writer.get_extra_info('peername')
+        print(f"NetworkOutput: New client connected from {client_addr}")
+        
+        # Cap the transport's write buffer so a stuck client surfaces
+        # as a slow drain in its sender task (which then drops oldest)
+        # instead of buffering unbounded audio in memory
+        try:
+            writer.transport.set_write_buffer_limits(high=256 * 1024)
+        except (AttributeError, NotImplementedError):
+            pass
+        
+        # Disable Nagle (small audio packets must not sit waiting for
+        # delayed ACKs) and widen the send buffer for sustained streams
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+                # Dead-peer detection belongs to the kernel, not a
+                # timer on the event loop: probe after 30s idle, then
+                # every 10s, give up after 3 misses (where supported)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                if hasattr(socket, 'TCP_KEEPIDLE'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+                if hasattr(socket, 'TCP_KEEPINTVL'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+                if hasattr(socket, 'TCP_KEEPCNT'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+            except OSError:
+                pass
+        
+        # Queue the format header (if available) before registering, so
+        # it is the first packet the sender task writes
+        sender = _ClientSender(writer)
+        if self._format_header_bytes is not None:
+            sender.send(self._format_header_bytes)
+            print(f"NetworkOutput: Sent format header to {client_addr}")
+        sender.start()
+        
+        with self._clients_lock:
+            self._clients[writer] = sender
+            self._senders_snapshot = tuple(self._clients.items())
+        
+        try:
+            # Drain anything the client sends until it disconnects.
+            # Liveness is the kernel's job now (SO_KEEPALIVE above);
+            # there is no more 30-second wakeup or 0x00 byte injected
+            # into the audio stream.
+            while await reader.read(4096):
+                pass
+                
+        except Exception as e:
+            logger.error("Client error: %s", e)
+        
+        finally:
+            # Remove from client list
+            with self._clients_lock:
+                self._clients.pop(writer, None)
+                self._senders_snapshot = tuple(self._clients.items())
+            await sender.close()
+            
+            # Close connection
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+            
+            print(f"NetworkOutput: Client disconnected. Active connections: {len(self._clients)}")
+    
+    async def _broadcast_data(self, data) -> None:
+        """
+        Broadcast data to all connected clients.
+
+        Fan-out is queue-only: the packet is appended to each
+        subscriber's bounded send queue and their drain tasks do the
+        actual socket I/O, so this never waits on a slow client.
+
+        Args:
+            data: Packet bytes, or a list of bytes-like fragments which
+                are handed to the transport without being joined first
+        """
+        disconnected = []
+        
+        # Iterate the immutable snapshot lock-free; registration swaps
+        # in a fresh tuple, so a concurrent connect or disconnect never
+        # mutates what this loop is walking
+        for writer, sender in self._senders_snapshot:
+            if sender.failed:
+                disconnected.append(writer)
+            else:
+                sender.send(data)
+        
+        # Remove clients whose sender task hit a write error; detach
+        # under the lock, close outside it
+        if disconnected:
+            reaped = []
+            with self._clients_lock:
+                for writer in disconnected:
+                    sender = self._clients.pop(writer, None)
+                    if sender:
+                        reaped.append((writer, sender))
+                self._senders_snapshot = tuple(self._clients.items())
+            for writer, sender in reaped:
+                await sender.close()
+                try:
+                    writer.close()
+                    await writer.wait_closed()
+                except Exception:
+                    pass
+    
+    def _create_format_header(self, format: AudioFormat) -> bytes:
+        """Create format header packet"""
+        flags = 0
+        if format.is_float:
+            flags |= 0x01
+        if format.is_interleaved:
+            flags |= 0x02
+        # Magic, version, packet type, sample rate, channels, bit
+        # depth, flags — packed in one call, all little-endian
+        return _FORMAT_HEADER.pack(
+            PROTOCOL_MAGIC,
+            PROTOCOL_VERSION,
+            PACKET_TYPE_FORMAT,
+            int(format.sample_rate),
+            format.channel_count,
+            format.bit_depth,
+            flags
+        )
+    
+    def _create_audio_header(
+        self,
+        buffer: AudioBuffer,
+        compressed_size: Optional[int] = None
+    ) -> bytes:
+        """
+        Pack the fixed audio packet header (13 bytes, or 17 with a
+        compressed-size field).
+
+        The payload travels separately (see _extract_audio_data) as a
+        scatter/gather fragment, so the samples are never copied into
+        an intermediate packet buffer.
+        """
+        # Packet type + timestamp (us since start) + frame count
+        timestamp_us = int((time.time() - self._start_time) * 1_000_000)
+        if compressed_size is not None:
+            return _COMPRESSED_HEADER.pack(
+                PACKET_TYPE_AUDIO_COMPRESSED, timestamp_us,
+                buffer.frame_count, compressed_size)
+        return _AUDIO_HEADER.pack(
+            PACKET_TYPE_AUDIO, timestamp_us, buffer.frame_count)
+    
+    def _create_end_packet(self) -> bytes:
+        """Create end-of-stream packet"""
+        timestamp_us = int((time.time() - self._start_time) * 1_000_000)
+        return _END_PACKET.pack(PACKET_TYPE_END, timestamp_us)
+    
+    def _extract_audio_data(self, buffer: AudioBuffer):
+        """
+        Extract audio data from buffer for network transport.
+
+        Returns:
+            (view, owned) where view is a byte memoryview over the
+            contiguous wire-dtype samples and owned is True when a
+            conversion allocated a fresh array — such a view belongs
+            exclusively to the caller and can be sent without another
+            copy
+        """
+        if self._transport_dtype is None:
+            self._update_format_cache(buffer.format)
+        
+        # Interleave via a transposed view — no intermediate buffer or
+        # wrapper objects; the single materializing pass below fuses
+        # the reorder with the dtype cast. Layout decisions were made
+        # once in _update_format_cache.
+        data = buffer.data
+        if self._needs_interleave and data.ndim > 1:
+            data = data.T
+        if self._quantize and data.dtype.kind == 'f':
+            # Fused scale-and-clip into a reused float scratch, then a
+            # fresh int16 copy: the result must be exclusively ours
+            # because the senders hold it after this call returns
+            scratch = self._quant_scratch
+            if scratch is None or scratch.shape != data.shape:
+                scratch = np.empty(data.shape, dtype='<f4')
+                self._quant_scratch = scratch
+            # The ufuncs read the (possibly transposed) view with
+            # strides, so interleave, scale and clip happen in the
+            # same pass
+            np.multiply(data, 32767.0, out=scratch)
+            np.clip(scratch, -32768.0, 32767.0, out=scratch)
+            arr = scratch.astype('<i2')
+            return memoryview(arr).cast('B'), True
+        arr = np.ascontiguousarray(data, dtype=self._transport_dtype)
+        return memoryview(arr).cast('B'), arr is not buffer.data
+    
+    def get_connection_count(self) -> int:
+        """Get current number of connected clients"""
+        return len(self._clients)
+    
+    def get_statistics(self) -> NetworkStatistics:
+        """Get network statistics"""
+        duration = time.time() - self._start_time
+        throughput_mbps = (self._bytes_sent / (1024 * 1024) / duration) if duration > 0 else 0
+        
+        return NetworkStatistics(
+            connection_count=len(self._clients),
+            packets_sent=self._packets_sent,
+            bytes_sent=self._bytes_sent,
+            duration=duration,
+            throughput_mbps=throughput_mbps
+        )
+
+
+class NetworkAudioClient:
+    """TCP client for receiving audio from network server"""
+    
+    def __init__(self, host: str = "localhost", port: int = 9876):
+        """
+        Initialize network audio client.
+        
+        Args:
+            host: Server host address
+            port: Server port number
+        """
+        self.host = host
+        self.port = port
+        
+        self._reader = None
+        self._writer = None
+        self._format = None
+        self._is_connected = False
+        self._start_time = 0.0
+        # Wire decode constants, derived once from the format header
+        self._wire_dtype = None
+        self._bytes_per_frame = 0
+    
+    async def connect(self) -> AudioFormat:
+        """
+        Connect to audio server and receive format header.
+        
+        Returns:
+            Audio format from server
+        """
+        if self._is_connected:
+            return self._format
+        
+        try:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+            
+            # Read format header
+            header = await self._read_format_header()
+            self._format = header
+            self._update_decode_cache(header)
+            self._start_time = time.time()
+            self._is_connected = True
+            
+            print(f"NetworkAudioClient: Connected to {self.host}:{self.port}")
+            print(f"  Format: {self._format.description}")
+            
+            return self._format
+            
+        except Exception as e:
+            raise NetworkConnectionFailedError(f"Failed to connect: {e}")
+    
+    async def disconnect(self) -> None:
+        """Disconnect from server"""
+        if not self._is_connected:
+            return
+        
+        if self._writer:
+            self._writer.close()
+            await self._writer.wait_closed()
+        
+        self._reader = None
+        self._writer = None
+        self._is_connected = False
+        
+        print("NetworkAudioClient: Disconnected")
+    
+    async def receive_audio(self) -> AsyncIterator[AudioBuffer]:
+        """
+        Receive audio buffers from server.
+        
+        Yields:
+            Audio buffers as they arrive
+        """
+        if not self._is_connected:
+            raise NetworkConnectionFailedError("Not connected to server")
+        
+        while self._is_connected:
+            try:
+                # Read packet type
+                packet_type = await self._reader.read(1)
+                if not packet_type:
+                    break
+                
+                packet_type = packet_type[0]
+                
+                if packet_type == PACKET_TYPE_AUDIO:
+                    # Read audio packet
+                    buffer = await self._read_audio_packet()
+                    if buffer:
+                        yield buffer
+                        
+                elif packet_type == PACKET_TYPE_AUDIO_COMPRESSED:
+                    buffer = await self._read_audio_packet(compressed=True)
+                    if buffer:
+                        yield buffer
+                        
+                elif packet_type == PACKET_TYPE_END:
+                    # End of stream
+                    await self._reader.readexactly(8)  # Skip timestamp
+                    break
+                    
+                elif packet_type == 0x00:
+                    # Keepalive - ignore
+                    continue
+                    
+                else:
+                    logger.error("Unknown packet type: %s", packet_type)
+                    
+            except asyncio.IncompleteReadError:
+                # Connection dropped mid-packet
+                break
+            except Exception as e:
+                logger.error("Receive error: %s", e)
+                break
+        
+        await self.disconnect()
+    
+    def _update_decode_cache(self, format: AudioFormat) -> None:
+        """Precompute the dtype and frame size used to decode packets"""
+        if format.is_float:
+            dtype = '<f4' if format.bit_depth == 32 else '<f8'
+        elif format.bit_depth == 16:
+            dtype = '<i2'
+        else:
+            dtype = '<i4'
+        self._wire_dtype = np.dtype(dtype)
+        self._bytes_per_frame = (
+            format.bit_depth // 8) * format.channel_count
+    
+    async def _read_format_header(self) -> AudioFormat:
+        """Read and parse format header"""
+        # Read magic bytes
+        magic = await self._reader.readexactly(len(PROTOCOL_MAGIC))
+        if magic != PROTOCOL_MAGIC:
+            raise StreamingProtocolError("Invalid protocol magic")
+        
+        # Read version
+        version = await self._reader.readexactly(1)
+        if version[0] != PROTOCOL_VERSION:
+            raise StreamingProtocolError(f"Unsupported protocol version: {version[0]}")
+        
+        # Read packet type
+        packet_type = await self._reader.readexactly(1)
+        if packet_type[0] != PACKET_TYPE_FORMAT:
+            raise StreamingProtocolError("Expected format packet")
+        
+        # Read format data
+        format_data = await self._reader.readexactly(_FORMAT_BODY.size)
+        
+        sample_rate, channels, bit_depth, flags = _FORMAT_BODY.unpack(format_data)
+        
+        is_float = bool(flags & 0x01)
+        is_interleaved = bool(flags & 0x02)
+        
+        return AudioFormat(
+            sample_rate=float(sample_rate),
+            channel_count=channels,
+            bit_depth=bit_depth,
+            is_interleaved=is_interleaved,
+            is_float=is_float
+        )
+    
+    async def _read_audio_packet(self, compressed: bool = False) -> Optional[AudioBuffer]:
+        """Read and parse audio packet"""
+        if compressed:
+            # Read header with compressed-size field
+            header = await self._reader.readexactly(_COMPRESSED_BODY.size)
+            timestamp_us, frame_count, data_size = _COMPRESSED_BODY.unpack(header)
+        else:
+            # Read header
+            header = await self._reader.readexactly(_AUDIO_BODY.size)
+            timestamp_us, frame_count = _AUDIO_BODY.unpack(header)
+            data_size = frame_count * self._bytes_per_frame
+        
+        # Read audio data
+        audio_data = await self._reader.readexactly(data_size)
+        
+        if compressed:
+            if blosc is None:
+                raise StreamingProtocolError(
+                    "Server is sending compressed audio but blosc is not installed")
+            audio_data = blosc.decompress(audio_data)
+        
+        # View the received bytes directly; frombuffer does not copy
+        samples = np.frombuffer(audio_data, dtype=self._wire_dtype)
+        
+        # Reshape based on format
+        if self._format.is_interleaved and self._format.channel_count > 1:
+            # Reshape from interleaved to (frames, channels)
+            samples = samples.reshape(-1, self._format.channel_count)
+        
+        # Create timestamp
+        timestamp = datetime.fromtimestamp(self._start_time + timestamp_us / 1_000_000)
+        
+        return AudioBuffer(
+            data=samples,
+            format=self._format,
+            timestamp=timestamp
         )
\ No newline at end of file
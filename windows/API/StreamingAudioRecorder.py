@@ -52,6 +52,7 @@ except ImportError:
         print("Warning: Neither PyAudioWPatch nor PyAudio found")
 
 from .AudioFormat import AudioFormat, AudioBuffer
+from .AudioBufferQueue import AudioBufferPool
 from .AudioDevice import AudioDevice, DeviceType
 from .AudioError import (
     DeviceNotFoundError, SessionStartFailedError,
@@ -141,6 +142,11 @@ class StreamingAudioRecorder:
         self._buffer_count = 0
         self._debug_log_count = 0
         
+        # Pooled capture copies: callback frames are copied into
+        # recycled arrays and returned to the pool once every delegate
+        # has consumed the buffer
+        self._buffer_pool = AudioBufferPool()
+        
         # Async event loop for delegates
         self._loop = None
         self._delegate_thread = None
@@ -404,11 +410,21 @@ class StreamingAudioRecorder:
         if not self._is_recording:
             return
         
-        # Process buffer (indata is already numpy array)
-        self._process_audio_data(indata.copy())
+        # Copy into a pooled array (indata is reused by sounddevice
+        # after the callback returns)
+        scratch = self._buffer_pool.acquire(indata.shape, indata.dtype)
+        np.copyto(scratch, indata)
+        self._process_audio_data(scratch, pooled=True)
     
-    def _process_audio_data(self, audio_data: np.ndarray):
-        """Process captured audio data"""
+    def _process_audio_data(self, audio_data: np.ndarray, pooled: bool = False):
+        """
+        Process captured audio data.
+        
+        Args:
+            audio_data: Captured samples
+            pooled: Whether audio_data came from the buffer pool and
+                should be released after delegates finish with it
+        """
         # Log initial debugging info
         if self._debug_log_count < 3:
             print(f"[{self._timestamp()}] StreamingAudioRecorder: Received audio buffer #{self._debug_log_count + 1}")
@@ -422,6 +438,10 @@ class StreamingAudioRecorder:
             format=self._format,
             timestamp=datetime.now()
         )
+        # Outputs that retain buffers past the fan-out (e.g. a stream
+        # queue) check this flag and detach with a copy before the
+        # array is recycled
+        buffer.pool_owned = pooled
         
         # Update statistics
         self._buffer_count += 1
@@ -432,9 +452,11 @@ class StreamingAudioRecorder:
         # Notify delegates asynchronously
         if self._loop:
             asyncio.run_coroutine_threadsafe(
-                self._notify_delegates_buffer(buffer),
+                self._notify_delegates_buffer(buffer, pooled),
                 self._loop
             )
+        elif pooled:
+            self._buffer_pool.release(audio_data)
     
     def _start_delegate_thread(self):
         """Start thread for async delegate notifications"""
@@ -450,7 +472,8 @@ class StreamingAudioRecorder:
         while self._loop is None:
             time.sleep(0.01)
     
-    async def _notify_delegates_buffer(self, buffer: AudioBuffer):
+    async def _notify_delegates_buffer(self, buffer: AudioBuffer,
+                                       release_to_pool: bool = False):
         """Notify all delegates of new buffer"""
         with self._delegate_lock:
             delegates = list(self._delegates)
@@ -460,6 +483,11 @@ class StreamingAudioRecorder:
                 await delegate.audio_streamer_did_receive(self, buffer)
             except Exception as e:
                 print(f"[{self._timestamp()}] StreamingAudioRecorder: Delegate error: {e}")
+        
+        # Every delegate (and through the multiplexer, every output)
+        # has been awaited, so the pooled array can be recycled
+        if release_to_pool:
+            self._buffer_pool.release(buffer.data)
     
     async def _notify_delegates_error(self, error: Exception):
         """Notify all delegates of error"""
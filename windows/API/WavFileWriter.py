@@ -169,6 +169,42 @@ class WavFileWriter:
             except Exception as e:
                 print(f"[{self._timestamp()}] WavFileWriter: Error writing buffer: {e}")
     
+    async def write_bytes(self, frames: bytes) -> None:
+        """
+        Write pre-encoded PCM frames, bypassing format conversion.
+
+        The caller is responsible for the bytes already being in the
+        file's sample format and interleaved layout.
+
+        Args:
+            frames: Raw PCM frame bytes
+        """
+        if not self._is_writing:
+            return
+
+        await asyncio.get_event_loop().run_in_executor(
+            None, self._write_bytes_sync, frames
+        )
+
+    def _write_bytes_sync(self, frames: bytes) -> None:
+        """Synchronous raw-frame write operation"""
+        with self._write_lock:
+            if not self._is_writing or not self._wave_file:
+                return
+
+            try:
+                self._wave_file.writeframes(frames)
+
+                self._buffers_written += 1
+                self._samples_written += len(frames) // self._sample_width
+
+                if self._buffers_written % 100 == 0:
+                    duration = self._samples_written / self.sample_rate
+                    print(f"[{self._timestamp()}] WavFileWriter: Written {self._buffers_written} buffers ({duration:.1f}s)")
+
+            except Exception as e:
+                print(f"[{self._timestamp()}] WavFileWriter: Error writing buffer: {e}")
+
     def _convert_audio_format(self, audio_data: np.ndarray) -> np.ndarray:
         """
         Convert audio data to the target format.